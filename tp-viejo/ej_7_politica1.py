@@ -21,13 +21,14 @@ Extensión (Política A - "metering" anticipado):
 """
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
+from enum import IntEnum
 from typing import Dict, List, Optional, Tuple, Set
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
 from matplotlib import animation
-import random
 
 # -----------------------
 # Constantes y utilidades
@@ -37,6 +38,9 @@ SEPARACION_MINIMA = 5.0  # separación deseada a ambos lados (min)
 SEPARACION_PELIGRO = 4.0 # debajo de esto, hay conflicto (actuar fuerte)
 VEL_TURNAROUND = 200.0   # kts alejándose
 MAX_DIVERTED_DISTANCE = 100.0      # si se aleja más de 100 nm -> diverted
+# Avance por paso precalculado (MINUTE plegado al importar, no en cada avión de cada paso)
+KTS_POR_NM_PASO = 60.0 / MINUTE                    # v_kts / KTS_POR_NM_PASO = nm recorridas en un paso
+RETRO_NM_PER_STEP = VEL_TURNAROUND / KTS_POR_NM_PASO  # nm que se aleja un avión en turnaround por paso
 DAY_START = 0
 DAY_END = 1080
 
@@ -59,57 +63,75 @@ def knots_to_nm_per_min(k: float) -> float:
 
 def velocidad_por_distancia(d_nm: float) -> Tuple[float, float]:
     ''' Devuelve (vmin, vmax) de la banda correspondiente a la distancia d_nm. '''
-    for dist_low, dist_high, vmin, vmax in VELOCIDADES:
-        if dist_low <= d_nm < dist_high:
-            return vmin, vmax
-    # si te pasas de los 100nm (raro por cómo seteamos apariciones), usar la banda más lejana
-    return VELOCIDADES[0][2], VELOCIDADES[0][3]
+    # búsqueda binaria sobre los bordes inferiores (dist_low <= d_nm < dist_high)
+    i = bisect_right(_BAND_EDGES_L, d_nm) - 1
+    if i < 0:
+        # fuera de las bandas: usar la banda más lejana (como el recorrido original)
+        return VELOCIDADES[0][2], VELOCIDADES[0][3]
+    return _BAND_VMIN_L[i], _BAND_VMAX_L[i]
+
+# Bandas ordenadas por borde inferior ascendente (para bisect): borde, vmin y vmax de cada una
+_BANDAS = sorted(VELOCIDADES)
+_BAND_EDGES_L = tuple(low for low, _, _, _ in _BANDAS)
+_BAND_VMIN_L = tuple(vmin for _, _, vmin, _ in _BANDAS)
+_BAND_VMAX_L = tuple(vmax for *_, vmax in _BANDAS)
 
 def mins_a_aep(dist_nm: float, speed_kts: float) -> float:
-    ''' cuantos minutos te faltan para llegar a aep si vas a speed_kts constante '''
+    ''' cuantos minutos te faltan para llegar a aep si vas a speed_kts en tu banda y a vmin de cada banda en las siguientes '''
+    # Mismo recorrido banda por banda que main.mins_a_aep (mismas cuentas y mismo empujón de 1e-6 nm en un borde
+    # exacto, así los empates contra los umbrales de 4/5 min salen igual que en el modelo base); sólo que la banda
+    # sale con un bisect en vez de recorrer VELOCIDADES cada vez.
     t = 0.0
     d = dist_nm
     v = speed_kts
     while d > 0:
-        for dist_low, dist_high, vmin, vmax in VELOCIDADES:
-            if dist_low <= d < dist_high: # estoy en esta banda
-                # distancia restante en la banda actual
-                dist_banda = min(d, d - dist_low)
-                if dist_banda <= 0:
-                    # Si no hay distancia para recorrer, salta a la siguiente banda
-                    d -= 1e-6
-                    continue
-                # tiempo para recorrer esa distancia a velocidad actual
-                t_banda = dist_banda / knots_to_nm_per_min(v)
-                t += t_banda
-                d -= dist_banda
-                # al pasar de banda, actualizo velocidad a vmax de la banda siguiente
-                v = vmin # vmin de mi banda actual es vmax de la siguiente
-                break
+        i = bisect_right(_BAND_EDGES_L, d) - 1  # banda con dist_low <= d < dist_high
+        dist_banda = d - _BAND_EDGES_L[i]
+        if dist_banda <= 0:
+            # justo en el borde: salta a la banda de abajo
+            d -= 1e-6
+            continue
+        t += dist_banda / (v / 60.0)  # knots_to_nm_per_min inline
+        d -= dist_banda
+        v = _BAND_VMIN_L[i]  # vmin de mi banda actual es vmax de la siguiente
     return t
 
-def g_objetivo(d_nm: float) -> float:
+def g_objetivo(d_nm: float, obj_sep_base: float = OBJ_SEP_BASE) -> float:
     """
     Target de separación deseada en minutos según distancia.
     - Más lejos pedimos un poquito más para evitar compresiones aguas abajo.
     - En tramo final, mantenemos 5 min (separación mínima operacional).
     """
     if d_nm >= 50.0:
-        return OBJ_SEP_BASE + 1.0   # p.ej. 7 si base=6
+        return obj_sep_base + 1.0   # p.ej. 7 si base=6
     if d_nm >= 15.0:
-        return OBJ_SEP_BASE         # p.ej. 6
+        return obj_sep_base         # p.ej. 6
     return 4.0                      # tramo final 5 min
 
+def tabla_g_objetivo(obj_sep_base: float = OBJ_SEP_BASE) -> Tuple[float, ...]:
+    '''
+    g_objetivo precalculada por nm entero: tabla[k] = g_objetivo(k) para k = 0..100.
+    Como los cortes (15 y 50 nm) son enteros, g_objetivo(d) == tabla[min(int(d), 100)] para todo d >= 0.
+    '''
+    return tuple(g_objetivo(float(k), obj_sep_base) for k in range(101))
+
+class Estado(IntEnum):
+    ''' estado de un avión (entero: comparar es una sola operación y entra en arrays int8) '''
+    APPROACH = 0
+    TURNAROUND = 1
+    LANDED = 2
+    DIVERTED = 3
+
 # -----------------
 # objeto Avión para simulación
 # -----------------
-@dataclass
+@dataclass(slots=True)  # sin __dict__ por instancia: menos memoria y acceso a atributos más rápido
 class Avion:
     id: int
     aparicion_min: int # minuto en el que aparece
     distancia_nm: float = 100.0
     velocidad_kts: float = 300.0
-    estado: str = "approach"  # approach | turnaround | diverted | landed
+    estado: Estado = Estado.APPROACH  # APPROACH | TURNAROUND | DIVERTED | LANDED
     leader_id: Optional[int] = None  # puntero a su líder en el carril approach
 
     def limites_velocidad(self) -> Tuple[float, float]:
@@ -120,21 +142,31 @@ class Avion:
         return mins_a_aep(self.distancia_nm, v)
 
 class TraficoAviones:
-    def __init__(self, seed: int = 42) -> None:
-        self.rng = random.Random(seed) # genera num aleatorios para apariciones
+    def __init__(self, seed: int | np.random.SeedSequence | np.random.Generator = 42,
+                 obj_sep_base: Optional[float] = None) -> None:
+        # genera num aleatorios para apariciones. Acepta un int, una SeedSequence (p.ej. hija de SeedSequence.spawn)
+        # o directamente un Generator, así cada corrida en paralelo tiene su propio stream independiente
+        self.rng = np.random.default_rng(seed)
+        # parámetro de la Política A propio de cada instancia (None -> constante del módulo)
+        self.obj_sep_base = OBJ_SEP_BASE if obj_sep_base is None else obj_sep_base
+        self.g_tabla = tabla_g_objetivo(self.obj_sep_base)
         self.next_id = 1 # próximo id a asignar
         self.planes: Dict[int, Avion] = {}
         self.activos: List[int] = []      # ids en approach (ordenados por ETA ascendente)
         self.turnaround: List[int] = []   # ids en turnaround
         self.inactivos: List[int] = []    # ids en diverted | landed
+        self.inactivos_landed: List[bool] = []  # paralela a inactivos: True si landed, False si diverted
         # Set de ids que acaban de pasar a turnaround para no moverlos en el mismo paso
         self.recien_turnaround: Set[int] = set()
+        # ETA (min) de cada activo con su dist/vel al final del último mover_paso (id -> ETA).
+        # activos queda ordenado por este valor, así control_paso no lo recalcula
+        self.eta_actual: Dict[int, float] = {}
 
     def aparicion(self, minuto: int) -> Avion:
         ''' crear un avion'''
         aid = self.next_id
         self.next_id += 1
-        av = Avion(id=aid, aparicion_min=minuto, distancia_nm=100.0, velocidad_kts=300.0, estado="approach")
+        av = Avion(id=aid, aparicion_min=minuto, distancia_nm=100.0, velocidad_kts=300.0, estado=Estado.APPROACH)
         self.planes[aid] = av
         self.activos.append(aid)
         return av
@@ -166,78 +198,89 @@ class TraficoAviones:
              apuntar a ETA = ETA_líder + g_objetivo(dist) con límites de banda.
         3) Intenta reinsertar desde turnaround a huecos globales.
         '''
-        # Foto de dist/vel previas a las decisiones del paso
-        speed_prev = {aid: self.planes[aid].velocidad_kts for aid in self.activos}
-        dist_prev  = {aid: self.planes[aid].distancia_nm  for aid in self.activos}
-        # Orden consistente usando la foto
-        self.ordenar_activos(current_speeds=speed_prev)
-
         # limpiar marcas de "recién enviados a turnaround" para este paso
         self.recien_turnaround.clear()
 
-        # --- Decidir en carril approach ---
-        for aid in list(self.activos):
-            av = self.planes[aid]
-            vmin, vmax = velocidad_por_distancia(dist_prev[aid])
+        # Foto (ETA, id, dist, vel) previa a las decisiones del paso.
+        # Cada ETA se calcula una sola vez: sirve para ordenar y, como ETA del líder, para el de atrás.
+        planes = self.planes
+        foto = []
+        eta_actual = self.eta_actual
+        for aid in self.activos:
+            av = planes[aid]
+            eta = eta_actual.get(aid)
+            if eta is None:
+                # recién aparecido (todavía no pasó por mover_paso)
+                eta = mins_a_aep(av.distancia_nm, av.velocidad_kts)
+            foto.append((eta, aid, av.distancia_nm, av.velocidad_kts))
+        # Orden consistente usando la foto (sort estable por ETA). activos ya viene ordenado
+        # desde mover_paso salvo los nuevos al final, así que el sort es casi lineal
+        foto.sort(key=lambda f: f[0])
+        self.activos = [f[1] for f in foto]
 
-            leader_id = av.leader_id
-            if leader_id is None:
+        # --- Decidir en carril approach ---
+        nuevos_turnaround = []  # se sacan de activos todos juntos al final (sin list.remove por avión)
+        lider = None  # foto del anterior en ETA
+        g_tabla = self.g_tabla
+        for f in foto:
+            my_mins_to_aep, aid, d, v = f
+            av = planes[aid]
+            av.leader_id = lider[1] if lider is not None else None
+            vmin, vmax = velocidad_por_distancia(d)
+
+            if lider is None:
                 # Sin líder: nadie delante -> ir a vmax (no hacemos metering al primero)
                 av.velocidad_kts = vmax
+                lider = f
                 continue
 
             # ETA del líder con su velocidad previa (foto consistente del paso)
-            my_mins_to_aep = mins_a_aep(dist_prev[aid], speed_prev[aid])
-            lead_mins_to_aep = mins_a_aep(dist_prev[leader_id], speed_prev[leader_id])
+            lead_mins_to_aep, _, _, lead_v = lider
+            lider = f
 
             # --- 1) Chequeo de seguridad (fallback original) ---
-            # Gap "pesimista" evaluado si YO fuera a vmax (peor caso para separación).
             gap = my_mins_to_aep - lead_mins_to_aep
 
             if gap < SEPARACION_PELIGRO:
                 # Como antes: tratar de frenar 20 kts por debajo del líder. Si no alcanza, turnaround.
-                nueva_vel = min(vmax, speed_prev[leader_id] - 20.0)
+                nueva_vel = min(vmax, lead_v - 20.0)
                 if nueva_vel < vmin:
-                    av.estado = "turnaround"
+                    av.estado = Estado.TURNAROUND
                     av.velocidad_kts = VEL_TURNAROUND
-                    self.mover_a_turnaround(aid)
-                    self.recien_turnaround.add(aid)  # para no moverlo en este mismo step
+                    av.leader_id = None
+                    nuevos_turnaround.append(aid)
                 else:
                     av.velocidad_kts = max(vmin, nueva_vel)
                 continue  # ya resolvimos el caso de peligro; saltamos metering
 
             # --- 2) Política A (metering anticipado) en zona segura ---
             # Predicción de gap si YO me mantuviera a vmax (no hay peligro, pero puede haber "compresión").
-            my_mins_to_aep_vmax = mins_a_aep(dist_prev[aid], vmax)
-            gap_pesimista = my_mins_to_aep_vmax - lead_mins_to_aep
-            pred_gap = gap_pesimista  # ya lo calculamos con my_mins_to_aep_vmax
+            pred_gap = mins_a_aep(d, vmax) - lead_mins_to_aep
 
             # Target deseado según distancia (más grande lejos), con un pequeño buffer
-            g_target = g_objetivo(dist_prev[aid])
+            g_target = g_tabla[int(d) if d < 100.0 else 100]  # = g_objetivo(d, self.obj_sep_base)
 
             if pred_gap < g_target + BUFFER_ANTICIPACION:
                 # Queremos llegar a t_target = ETA_líder + g_target
                 t_target = lead_mins_to_aep + g_target
                 # Velocidad requerida (nm/min -> kts) respetando límites físicos de la banda
-                v_req = (dist_prev[aid] / t_target) * 60.0 if t_target > 0 else vmax
+                v_req = (d / t_target) * 60.0 if t_target > 0 else vmax
                 v_req = min(max(v_req, vmin), vmax)
                 av.velocidad_kts = v_req
             else:
                 # Ya hay suficiente aire -> mantener vmax (política "no interferir")
                 av.velocidad_kts = vmax
 
+        if nuevos_turnaround:
+            # para no moverlos en este mismo step
+            self.recien_turnaround.update(nuevos_turnaround)
+            self.activos = [aid for aid in self.activos if aid not in self.recien_turnaround]
+            self.turnaround.extend(nuevos_turnaround)
+
         # Intento de reingreso global desde turnaround (tu lógica original)
         activos_order = list(self.activos)
         self.intentar_reingreso(activos_order)
 
-    def mover_a_turnaround(self, aid: int) -> None:
-        ''' mueve un avión del carril activo al carril turnaround '''
-        if aid in self.activos:
-            self.activos.remove(aid)
-        if aid not in self.turnaround:
-            self.turnaround.append(aid)
-        self.planes[aid].leader_id = None
-
     def mover_a_activos(self, aid: int) -> None:
         ''' mueve un avión del carril turnaround al carril activo cuando reingresa '''
         if aid in self.turnaround:
@@ -245,30 +288,40 @@ class TraficoAviones:
         if aid not in self.activos:
             self.activos.append(aid)
 
-    def mover_a_inactivos(self, aid: int) -> None:
-        ''' mueve un avión del carril activo o turnaround a inactivos (landed o diverted) '''
-        if aid in self.activos:
-            self.activos.remove(aid)
-        if aid in self.turnaround:
-            self.turnaround.remove(aid)
-        if aid not in self.inactivos:
-            self.inactivos.append(aid)
+    def agregar_a_inactivos(self, aid: int) -> None:
+        ''' agrega a inactivos un avión que ya salió de su carril (sin buscarlo en las listas) '''
+        self.inactivos.append(aid)
+        self.inactivos_landed.append(self.planes[aid].estado == Estado.LANDED)
         self.planes[aid].leader_id = None
 
     # Reingreso desde turnaround: busca huecos globales y ajusta velocidad
     def intentar_reingreso(self, activos_order: List[int]) -> None:
+        if not self.turnaround:
+            # nadie para reinsertar: no hace falta calcular las ETAs de approach
+            return
         if not activos_order:
             # Sin nadie en approach -> todos reingresan directo a vmax
             for aid in list(self.turnaround):
                 av = self.planes[aid]
                 vmin, vmax = av.limites_velocidad()
                 av.velocidad_kts = vmax
-                av.estado = "approach"
+                av.estado = Estado.APPROACH
                 self.mover_a_activos(aid)
             return
 
         activos_mins_to_aep = [(aid, self.planes[aid].tiempo_a_aep()) for aid in activos_order]
         activos_mins_to_aep.sort(key=lambda x: x[1])
+        etas = [t for _, t in activos_mins_to_aep]
+        # Huecos libres entre pares consecutivos: [t1 + SEP, t2 - SEP] (el complemento de los
+        # intervalos ocupados [eta - SEP, eta + SEP]). Se arman una sola vez para todos los de turnaround;
+        # quedan ordenados y disjuntos, así que huecos_low y huecos_high son crecientes
+        huecos_low, huecos_high = [], []
+        for t1, t2 in zip(etas, etas[1:]):
+            t_low  = t1 + SEPARACION_MINIMA
+            t_high = t2 - SEPARACION_MINIMA
+            if t_high >= t_low:
+                huecos_low.append(t_low)
+                huecos_high.append(t_high)
 
         for aid in list(self.turnaround):
             av = self.planes[aid]
@@ -278,12 +331,12 @@ class TraficoAviones:
             mins_to_aep_slow = mins_a_aep(d, vmin)
 
             reinsertado = False
-            # Buscar gap entre pares consecutivos
-            for (a1, t1), (a2, t2) in zip(activos_mins_to_aep, activos_mins_to_aep[1:]):
-                t_low  = t1 + SEPARACION_MINIMA
-                t_high = t2 - SEPARACION_MINIMA
-                if t_high < t_low:
-                    continue
+            # Un hueco sirve si se solapa con [fast, slow]: t_high >= fast y t_low <= slow.
+            # Con búsqueda binaria se ubican exactamente esos huecos, en orden
+            k_lo = bisect_left(huecos_high, mins_to_aep_fast)
+            k_hi = bisect_right(huecos_low, mins_to_aep_slow)
+            for k in range(k_lo, k_hi):
+                t_low, t_high = huecos_low[k], huecos_high[k]
 
                 a = max(t_low, mins_to_aep_fast)
                 b = min(t_high, mins_to_aep_slow)
@@ -294,7 +347,7 @@ class TraficoAviones:
                     my_eta = mins_a_aep(d, v_target)
                     if t_low <= my_eta <= t_high:
                         av.velocidad_kts = v_target
-                        av.estado = "approach"
+                        av.estado = Estado.APPROACH
                         self.mover_a_activos(aid)
                         reinsertado = True
                         break
@@ -312,7 +365,7 @@ class TraficoAviones:
                     my_eta = mins_a_aep(d, v_target)
                     if my_eta <= t_high:
                         av.velocidad_kts = v_target
-                        av.estado = "approach"
+                        av.estado = Estado.APPROACH
                         self.mover_a_activos(aid)
                         reinsertado = True
 
@@ -329,46 +382,63 @@ class TraficoAviones:
                     my_eta = mins_a_aep(d, v_target)
                     if my_eta >= t_low:
                         av.velocidad_kts = v_target
-                        av.estado = "approach"
+                        av.estado = Estado.APPROACH
                         self.mover_a_activos(aid)
                         reinsertado = True
             # Si no reinsertó: sigue en turnaround
 
     def mover_paso(self) -> None:
-        # approach
-        for aid in list(self.activos):
+        # approach (de paso se guarda la ETA nueva de cada uno para ordenar sin recalcular)
+        # los que siguen en cada carril se juntan en listas nuevas (una pasada, sin list.remove)
+        eta_actual = {}
+        siguen = []
+        for aid in self.activos:
             av = self.planes[aid]
-            avance_nm = knots_to_nm_per_min(av.velocidad_kts) * MINUTE
+            avance_nm = av.velocidad_kts / KTS_POR_NM_PASO
             av.distancia_nm = max(0.0, av.distancia_nm - avance_nm)
             if av.distancia_nm <= 0.0: # llegó a aep
                 av.distancia_nm = 0.0
                 av.velocidad_kts = 0.0
-                av.estado = "landed"
-                self.mover_a_inactivos(aid)
+                av.estado = Estado.LANDED
+                self.agregar_a_inactivos(aid)
+            else:
+                eta_actual[aid] = mins_a_aep(av.distancia_nm, av.velocidad_kts)
+                siguen.append(aid)
+        self.activos = siguen
+        self.eta_actual = eta_actual
         # turnaround
-        for aid in list(self.turnaround):
+        siguen = []
+        for aid in self.turnaround:
             av = self.planes[aid]
             if aid in self.recien_turnaround:
                 # no mover en el mismo paso del cambio a turnaround
+                siguen.append(aid)
                 continue
-            retro_nm = knots_to_nm_per_min(VEL_TURNAROUND) * MINUTE
-            av.distancia_nm += retro_nm
+            av.distancia_nm += RETRO_NM_PER_STEP
             if av.distancia_nm >= MAX_DIVERTED_DISTANCE:
-                av.estado = "diverted"
-                self.mover_a_inactivos(aid)
-        # recalcular orden y líderes para próximo paso
-        self.ordenar_activos()
+                av.estado = Estado.DIVERTED
+                self.agregar_a_inactivos(aid)
+            else:
+                siguen.append(aid)
+        self.turnaround = siguen
+        # recalcular orden y líderes para próximo paso (con las ETAs recién guardadas)
+        self.activos.sort(key=eta_actual.__getitem__)
+        for i, aid in enumerate(self.activos):
+            self.planes[aid].leader_id = self.activos[i-1] if i > 0 else None
 
     def bernoulli_aparicion(self, lam_per_min: float, t0: int = DAY_START, t1: int = DAY_END) -> List[int]:
         '''
         devuelve una lista de los t's en los que aparecen los aviones
         la bernoulli es una aproximación de la forma discreta al proceso de Poisson
         '''
-        apariciones = []
-        for t in range(t0, t1):
-            if self.rng.random() < lam_per_min:
-                apariciones.append(t)
-        return apariciones
+        return (np.flatnonzero(self.mascara_aparicion(lam_per_min, t0, t1)) + t0).tolist()
+
+    def mascara_aparicion(self, lam_per_min: float, t0: int = DAY_START, t1: int = DAY_END) -> np.ndarray:
+        '''
+        igual que bernoulli_aparicion pero como máscara booleana (índice t - t0): una sola llamada
+        vectorizada al rng (mismo stream que sortear minuto a minuto) y en el loop se indexa en vez de buscar en un set
+        '''
+        return self.rng.random(t1 - t0) < lam_per_min
 
     def step(self, minuto: int, aparicion: bool) -> None:
         if aparicion:
@@ -382,43 +452,38 @@ class TraficoAviones:
 #################
 def snapshot_frame(ctrl: TraficoAviones) -> Dict[str, np.ndarray]:
     # Mapea cada avión a una coordenada (x, y) y color según estado.
-    xs = []
-    ys = []
-    cs = []
+    # Se llenan arrays preasignados por tramos (approach | turnaround | inactivos) en vez de listas + append.
+    planes = ctrl.planes
+    na, nt = len(ctrl.activos), len(ctrl.turnaround)
+    n = na + nt + len(ctrl.inactivos)
+    xs = np.empty(n, dtype=float)
+    ys = np.empty(n, dtype=float)
+    cs = np.empty(n, dtype=object)
     # Carriles: approach en y=1, turnaround en y=0
-    for aid in ctrl.activos:
-        av = ctrl.planes[aid]
-        xs.append(av.distancia_nm)
-        ys.append(1.0)
-        cs.append('tab:blue')
-    for aid in ctrl.turnaround:
-        av = ctrl.planes[aid]
-        xs.append(av.distancia_nm)
-        ys.append(0.0)
-        cs.append('tab:red')
+    xs[:na] = [planes[aid].distancia_nm for aid in ctrl.activos]
+    ys[:na] = 1.0
+    cs[:na] = 'tab:blue'
+    xs[na:na+nt] = [planes[aid].distancia_nm for aid in ctrl.turnaround]
+    ys[na:na+nt] = 0.0
+    cs[na:na+nt] = 'tab:red'
     # Inactivos: apilamos con pequeños offsets en Y para ver múltiples
-    landed_idx = 0
-    diverted_idx = 0
+    # (el k-ésimo landed / diverted sale de la suma acumulada de cada máscara)
     y_step = 0.03
-    for aid in ctrl.inactivos:
-        av = ctrl.planes[aid]
-        if av.estado == 'landed':
-            xs.append(0.0)
-            ys.append(1.0 - landed_idx * y_step)
-            cs.append('tab:green')
-            landed_idx += 1
-        elif av.estado == 'diverted':
-            xs.append(110.0)
-            ys.append(-0.5 + diverted_idx * y_step)
-            cs.append('gray')
-            diverted_idx += 1
+    landed = np.array(ctrl.inactivos_landed, dtype=bool)
+    diverted = ~landed
+    landed_idx = np.cumsum(landed) - landed
+    diverted_idx = np.cumsum(diverted) - diverted
+    xs[na+nt:] = np.where(landed, 0.0, 110.0)
+    ys[na+nt:] = np.where(landed, 1.0 - landed_idx * y_step, -0.5 + diverted_idx * y_step)
+    cs[na+nt:] = np.where(landed, 'tab:green', 'gray')
     return {
-        'x': np.array(xs, dtype=float),
-        'y': np.array(ys, dtype=float),
-        'c': np.array(cs, dtype=object),
+        'x': xs,
+        'y': ys,
+        'c': cs,
     }
 
-def save_gif_frames(frames: List[Dict[str, np.ndarray]], out_path: str = "simulaciones/sim.gif", fps: int = 10, label_text: Optional[str] = None):
+def _preparar_figura(label_text: Optional[str] = None):
+    ''' figura, ejes y scatter vacíos para dibujar los frames (compartido por save_gif_frames y el streaming) '''
     # Configuración de figura
     x_max = 120.0
     fig, ax = plt.subplots(figsize=(10, 5))
@@ -441,6 +506,15 @@ def save_gif_frames(frames: List[Dict[str, np.ndarray]], out_path: str = "simula
     ]
     ax.legend(handles=legend_handles, loc='upper right')
     ax.axvline(100.0, color='k', linestyle=':', linewidth=0.8, alpha=0.7)
+    return fig, ax, scat
+
+def _dibujar_frame(ax, scat, f: Dict[str, np.ndarray], i: int) -> None:
+    scat.set_offsets(np.column_stack((f['x'], f['y'])))
+    scat.set_color(f['c'])
+    ax.set_title(f"minuto {i}")
+
+def save_gif_frames(frames: List[Dict[str, np.ndarray]], out_path: str = "simulaciones/sim.gif", fps: int = 10, label_text: Optional[str] = None):
+    fig, ax, scat = _preparar_figura(label_text)
 
     def init():
         scat.set_offsets(np.empty((0, 2)))
@@ -448,11 +522,7 @@ def save_gif_frames(frames: List[Dict[str, np.ndarray]], out_path: str = "simula
         return scat,
 
     def update(i):
-        f = frames[i]
-        pts = np.column_stack((f['x'], f['y']))
-        scat.set_offsets(pts)
-        scat.set_color(f['c'])
-        ax.set_title(f"minuto {i}")
+        _dibujar_frame(ax, scat, frames[i], i)
         return scat,
 
     anim = animation.FuncAnimation(
@@ -464,19 +534,36 @@ def save_gif_frames(frames: List[Dict[str, np.ndarray]], out_path: str = "simula
     except Exception as e:
         print(f"No se pudo guardar el GIF: {e}")
 
+def simular_y_guardar_gif(ctrl: TraficoAviones, apariciones: np.ndarray, out_path: str = "simulaciones/sim.gif",
+                          fps: int = 10, label_text: Optional[str] = None,
+                          t0: int = DAY_START, t1: int = DAY_END) -> None:
+    '''
+    Corre la simulación y escribe cada minuto directo al GIF (PillowWriter.grab_frame), sin guardar
+    la lista de frames: la memoria queda en O(aviones de un frame) en vez de O(minutos x aviones).
+    apariciones: máscara booleana indexada por t - t0 (ver mascara_aparicion).
+    '''
+    fig, ax, scat = _preparar_figura(label_text)
+    writer = animation.PillowWriter(fps=fps)
+    try:
+        with writer.saving(fig, out_path, fig.dpi):
+            for i, t in enumerate(range(t0, t1)):
+                ctrl.step(t, aparicion=bool(apariciones[t - t0]))
+                _dibujar_frame(ax, scat, snapshot_frame(ctrl), i)
+                writer.grab_frame()
+        print(f"GIF guardado en {out_path}")
+    except Exception as e:
+        print(f"No se pudo guardar el GIF: {e}")
+    plt.close(fig)
+
 if __name__ == "__main__":
     ######
     #! Simulación
     ######
     lamb = 0.1
     trafico_sim = TraficoAviones(seed=42)
-    apariciones = set(trafico_sim.bernoulli_aparicion(lamb))
-
-    frames: List[Dict[str, np.ndarray]] = []
-    for t in range(DAY_START, DAY_END):
-        trafico_sim.step(t, aparicion=(t in apariciones))
-        frames.append(snapshot_frame(trafico_sim))
+    apariciones = trafico_sim.mascara_aparicion(lamb)
 
     l = str(lamb).replace(".", "")
     gif_name = f"sim_lambda{l}" + ".gif"
-    save_gif_frames(frames, out_path=f"simulaciones/{gif_name}", fps=5, label_text=f"λ = {lamb}")
+    # los frames se escriben a medida que avanza la simulación (no se acumulan en memoria)
+    simular_y_guardar_gif(trafico_sim, apariciones, out_path=f"simulaciones/{gif_name}", fps=5, label_text=f"λ = {lamb}")
@@ -14,13 +14,13 @@ Unidades: distancia en nm, velocidades en kts, tiempo en minutos.
 """
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Set
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
 from matplotlib import animation
-import random
 
 # -----------------------
 # Constantes y utilidades
@@ -78,7 +78,7 @@ def mins_a_aep(dist_nm: float, speed_kts: float) -> float:
 # -----------------
 # objeto Avión para simulación
 # -----------------
-@dataclass
+@dataclass(slots=True)  # sin __dict__ por instancia: menos memoria y acceso a atributos más rápido
 class Avion:
    id: int
    aparicion_min: int # minuto en el que aparece
@@ -95,8 +95,10 @@ class Avion:
       return mins_a_aep(self.distancia_nm, v)
 
 class TraficoAviones:
-   def __init__(self, seed: int = 42) -> None:
-      self.rng = random.Random(seed) # genera num aleatorios para apariciones
+   def __init__(self, seed: int | np.random.SeedSequence | np.random.Generator = 42) -> None:
+      # genera num aleatorios para apariciones. Acepta un int, una SeedSequence (p.ej. hija de SeedSequence.spawn)
+      # o directamente un Generator, así cada corrida en paralelo tiene su propio stream independiente
+      self.rng = np.random.default_rng(seed)
       self.next_id = 1 # próximo id a asignar (va incrementándose cada vez que aparece un avión)
       self.planes: Dict[int, Avion] = {} # mapeo id -> Avion para acceder más rápido (sin tener que recorrer la lista)
       self.activos: List[int] = []      # ids en estado approach (ordenados por mins_to_aep ascendente)
@@ -124,6 +126,8 @@ class TraficoAviones:
          v = av.velocidad_kts if current_speeds is None else current_speeds[aid]
          return av.tiempo_a_aep(v)
       # ordena los activos por tiempo de llegada a aep
+      # (entre un minuto y el siguiente la lista casi no cambia de orden, y el sort de Python (timsort) detecta los
+      #  tramos ya ordenados: sale en ~O(N))
       self.activos.sort(key=tiempo_estimado)
       # actualizar punteros a líder: líder = anterior en mins_to_aep (None para el primero)
       for i, aid in enumerate(self.activos):
@@ -136,41 +140,53 @@ class TraficoAviones:
       '''
       # pone los nuevos aviones que van a ser turnaroudn y vacia la lista del minuto anterior de los que recien estaban turnaround
       # 
-      # para el diccionario de current_speeds de distancias/velocidades
-      speed_prev = {aid: self.planes[aid].velocidad_kts for aid in self.activos}
-      dist_prev = {aid: self.planes[aid].distancia_nm for aid in self.activos}
-      self.ordenar_activos(current_speeds=speed_prev)
+      self.ordenar_activos() # (todavía nadie cambió de velocidad en este minuto: ordena con las del minuto anterior)
+
+      # "foto" de distancias/velocidades del minuto anterior, por posición en self.activos (ya ordenado): el líder del
+      # i-ésimo es el (i-1)-ésimo. Listas y no diccionarios: se indexan por posición, sin hashear ids
+      dist_prev = [self.planes[aid].distancia_nm for aid in self.activos]
+      speed_prev = [self.planes[aid].velocidad_kts for aid in self.activos]
+      mins_prev = [mins_a_aep(d, v) for d, v in zip(dist_prev, speed_prev)] # cada uno una vez (antes: como propio y como líder)
 
       self.recien_turnaround.clear()
+      nuevos_turnaround = []  # se sacan de activos todos juntos al final (sin list.remove por avión)
+      limites = {}  # aid -> (vmin, vmax) de la banda en la que estaba al empezar el minuto
       # Decidir en carril approach
-      for aid in list(self.activos):
+      for i, aid in enumerate(self.activos):
          av = self.planes[aid]
-         vmin, vmax = velocidad_por_distancia(dist_prev[aid])
+         limites[aid] = velocidad_por_distancia(dist_prev[i])  # se reusa en intentar_reingreso si este mismo minuto pasa a turnaround
+         vmin, vmax = limites[aid]
 
          leader_id = av.leader_id
          if leader_id is None:
                av.velocidad_kts = vmax
                continue
 
-         my_mins_to_aep = mins_a_aep(dist_prev[aid], speed_prev[aid])
-         lead_mins_to_aep = mins_a_aep(dist_prev[leader_id], speed_prev[leader_id])
+         my_mins_to_aep = mins_prev[i]
+         lead_mins_to_aep = mins_prev[i-1] # leader_id == self.activos[i-1]
          gap = my_mins_to_aep - lead_mins_to_aep
 
          if gap < SEPARACION_PELIGRO:
-               nueva_vel = min(vmax, speed_prev[leader_id] - 20.0)
+               nueva_vel = min(vmax, speed_prev[i-1] - 20.0)
                if nueva_vel < vmin:
                   av.estado = "turnaround"
                   av.velocidad_kts = VEL_TURNAROUND
-                  self.mover_a_turnaround(aid)
-                  self.recien_turnaround.add(aid)
+                  av.leader_id = None # ya no tiene líder en el carril approach
+                  nuevos_turnaround.append(aid)
                else:
                   av.velocidad_kts = max(vmin, nueva_vel)
          else:
                av.velocidad_kts = vmax
 
+      if nuevos_turnaround:
+         # para no moverlos en este mismo step
+         self.recien_turnaround.update(nuevos_turnaround)
+         self.activos = [aid for aid in self.activos if aid not in self.recien_turnaround]
+         self.turnaround.extend(nuevos_turnaround)
+
       # busco un gap en el que reingresar a los aviones en turnaround en el carril activo/approach
       activos_order = list(self.activos) # lo convierto a lista para no tener problemas si se modifica durante la iteración (es una copia)
-      self.intentar_reingreso(activos_order) # en cada step intento reingresar a todos los aviones en turnaround (OJO: no pueden reingresar dos aviones en el mismo step)
+      self.intentar_reingreso(activos_order, limites) # en cada step intento reingresar a todos los aviones en turnaround (OJO: no pueden reingresar dos aviones en el mismo step)
 
    def mover_a_turnaround(self, aid: int) -> None:
       ''' mueve un avión del carril activo al carril turnaround '''
@@ -198,14 +214,15 @@ class TraficoAviones:
       self.planes[aid].leader_id = None
 
    # Reingreso desde turnaround: busca huecos globales y ajusta velocidad
-   def intentar_reingreso(self, activos_order: List[int]) -> None:
+   def intentar_reingreso(self, activos_order: List[int], limites: Optional[Dict[int, Tuple[float, float]]] = None) -> None:
+      limites = limites or {}
       #!politica 2b: reingreso con orden FIFO de turnaround (el que más tiempo lleva en turnaround reingresa primero)
       turnaround_sorted = self.turnaround.copy() # como self.turnaround se va actualizando con un append, esta en orden FIFO
       
       if not activos_order: # si no hay ningun avion en el carril de activos --> reingresan todos a vmax (es como darlos vuelta de dirección y pasarlos de carril)
          for aid in turnaround_sorted:
                av = self.planes[aid]
-               vmin, vmax = av.limites_velocidad()
+               vmin, vmax = limites.get(aid) or av.limites_velocidad()
                av.velocidad_kts = vmax
                av.estado = "approach"
                self.mover_a_activos(aid)
@@ -213,17 +230,23 @@ class TraficoAviones:
 
       activos_mins_to_aep = [(aid, self.planes[aid].tiempo_a_aep()) for aid in activos_order]
       activos_mins_to_aep.sort(key=lambda x: x[1])
+      # bordes de los huecos (en el mismo orden): con bisect se busca qué pares le pueden servir a cada avión
+      t_lows = [mins + SEPARACION_MINIMA for _, mins in activos_mins_to_aep]
+      t_highs = [mins - SEPARACION_MINIMA for _, mins in activos_mins_to_aep]
 
       for aid in turnaround_sorted:
          av = self.planes[aid]
          d = av.distancia_nm
-         vmin, vmax = av.limites_velocidad()
+         vmin, vmax = limites.get(aid) or av.limites_velocidad()
          mins_to_aep_fast = mins_a_aep(d, vmax) # cuanto tardaría si fuese a la velocidad máxima
          mins_to_aep_slow = mins_a_aep(d, vmin) # cuanto tardaría si fuese a la velocidad mínima
 
          reinsertado = False
          # busco gap entre pares de aviones "consecutivos" (en la lista ordenada por mins_to_aep)
-         for (a1, mins_to_aep1), (a2, mins_to_aep2) in zip(activos_mins_to_aep, activos_mins_to_aep[1:]):
+         # (sólo los pares con t_high >= mins_to_aep_fast y t_low <= mins_to_aep_slow; en los demás a > b seguro)
+         desde = max(bisect_left(t_highs, mins_to_aep_fast) - 1, 0)
+         hasta = bisect_right(t_lows, mins_to_aep_slow)
+         for (a1, mins_to_aep1), (a2, mins_to_aep2) in zip(activos_mins_to_aep[desde:hasta], activos_mins_to_aep[desde+1:hasta+1]):
                t_low = mins_to_aep1 + SEPARACION_MINIMA # mins que le faltan al anterior + 5 min de separación (minutos minimos en los que podrias llegar)
                t_high = mins_to_aep2 - SEPARACION_MINIMA # mins que le faltan al siguiente - 5 min de separación (minutos maximos en los que podrias llegar)
 
@@ -297,27 +320,42 @@ class TraficoAviones:
          # si no reinsertó: sigue en turnaround
 
    def mover_paso(self) -> None:
+      # los que siguen en cada carril se juntan en listas nuevas (una pasada, sin list.remove por avión)
+      inactivar = []
+      siguen = []
       # approach
-      for aid in list(self.activos):
+      for aid in self.activos:
          av = self.planes[aid]
          avance_nm = knots_to_nm_per_min(av.velocidad_kts) * MINUTE
          av.distancia_nm = max(0.0, av.distancia_nm - avance_nm)
          if av.distancia_nm <= 0.0: # llegó a aep
-               av.distancia_nm = 0.0
-               av.velocidad_kts = 0.0
-               av.estado = "landed"
-               self.mover_a_inactivos(aid)
+            av.distancia_nm = 0.0
+            av.velocidad_kts = 0.0
+            av.estado = "landed"
+            inactivar.append(aid)
+         else:
+            siguen.append(aid)
+      self.activos = siguen
       # turnaround
-      for aid in list(self.turnaround):
+      siguen = []
+      for aid in self.turnaround:
          av = self.planes[aid]
          if aid in self.recien_turnaround:
-               # no mover en el mismo paso del cambio a turnaround
-               continue
+            # no mover en el mismo paso del cambio a turnaround
+            siguen.append(aid)
+            continue
          retro_nm = knots_to_nm_per_min(VEL_TURNAROUND) * MINUTE
          av.distancia_nm += retro_nm
          if av.distancia_nm >= MAX_DIVERTED_DISTANCE:
-               av.estado = "diverted"
-               self.mover_a_inactivos(aid)
+            av.estado = "diverted"
+            inactivar.append(aid)
+         else:
+            siguen.append(aid)
+      self.turnaround = siguen
+      # ya salieron de sus carriles: se agregan a inactivos en el mismo orden de antes
+      for aid in inactivar:
+         self.inactivos.append(aid)
+         self.planes[aid].leader_id = None
       # recalcular orden y líderes para próximo paso
       self.ordenar_activos()
 
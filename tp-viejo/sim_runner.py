@@ -0,0 +1,243 @@
+# sim_runner.py
+# Motor compartido por los drivers del ejercicio 7 (ej_7_barrido, ej_7_base_vs_politica1, ej_7_base_vs_politicas2):
+# una corrida, varias corridas con su agregación (media ± EE) y los gráficos vs λ.
+# Cada driver sólo elige la clase TraficoAviones y las etiquetas.
+
+import importlib
+import math
+import os
+from enum import IntEnum
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from main import VELOCIDADES, DAY_START, DAY_END
+
+# ---------- Tiempo ideal (mínimo físico) usando las bandas ----------
+def _tabla_bandas(velocidades):
+    """
+    Precalcula (una sola vez) la tabla por bandas, ordenada por borde inferior ascendente:
+    - band_edges[i]: borde inferior de la banda i (nm)
+    - band_v[i]: vmax de la banda i en nm/min
+    - cum[i]: tiempo mínimo (min) para ir desde band_edges[i] hasta 0 a vmax de cada banda
+    """
+    bandas = sorted(velocidades)
+    band_edges = np.array([low for low, _, _, _ in bandas])
+    band_v = np.array([vmax / 60.0 for *_, vmax in bandas])
+    cum = np.concatenate([[0.0], np.cumsum((band_edges[1:] - band_edges[:-1]) / band_v[:-1])])
+    return band_edges, band_v, cum
+
+BAND_EDGES, BAND_V, CUM_T = _tabla_bandas(VELOCIDADES)
+
+def tiempo_ideal_desde(d_nm_inicial: float) -> float:
+    """Tiempo mínimo (min) para ir desde d_nm_inicial a 0 usando SIEMPRE vmax de cada banda."""
+    d = float(d_nm_inicial)
+    if d <= 0.0:
+        return 0.0
+    # banda que contiene a d (en un borde exacto se usa la banda de abajo)
+    i = int(np.searchsorted(BAND_EDGES, d, side="left")) - 1
+    return float(CUM_T[i] + (d - BAND_EDGES[i]) / BAND_V[i])
+
+T_IDEAL_100 = tiempo_ideal_desde(100.0)  # todos aparecen a 100 nm
+
+# ---------- Apariciones (números aleatorios comunes) ----------
+def mascara_apariciones(lam: float, seed: int | np.random.SeedSequence,
+                        day_start: int = DAY_START, day_end: int = DAY_END) -> np.ndarray:
+    """
+    Bernoulli(λ) por minuto como máscara booleana (índice t - day_start).
+    Consume el mismo stream que TraficoAviones.bernoulli_aparicion con ese seed,
+    así que da exactamente las mismas apariciones, pero se sortea una sola vez y se puede
+    reusar entre configuraciones (números aleatorios comunes).
+    """
+    return np.random.default_rng(seed).random(day_end - day_start) < lam
+
+# ---------- Motor de una corrida ----------
+def _nombre_estado(estado) -> str:
+    ''' los controladores viejos guardan el estado como str; ej_7_politica1 usa Estado (IntEnum) '''
+    return estado.name.lower() if isinstance(estado, IntEnum) else estado
+
+def correr_una_vez(TA_cls, lam: float, seed: int | np.random.SeedSequence,
+                   day_start: int = DAY_START, day_end: int = DAY_END,
+                   ctrl_kwargs: Optional[Dict[str, Any]] = None,
+                   apariciones: Optional[np.ndarray] = None) -> Dict[str, float]:
+    """
+    Ejecuta una simulación con clase TA_cls (kwargs extra van a su constructor),
+    devuelve métricas agregadas para atraso y desvíos.
+    Si se pasa `apariciones` (máscara de mascara_apariciones) no se vuelve a sortear.
+    """
+    ctrl = TA_cls(seed=seed, **(ctrl_kwargs or {}))
+    if apariciones is None:
+        apariciones = mascara_apariciones(lam, seed, day_start, day_end)
+
+    # a lo sumo una aparición por minuto y los ids arrancan en 1 -> arrays indexados por aid
+    n_max = day_end - day_start + 1
+    landed_t = np.full(n_max, -1, np.int32)   # aid -> minuto aterrizaje (-1 = no aterrizó)
+    div_flag = np.zeros(n_max, np.bool_)      # aid -> se desvió
+
+    # inactivos sólo crece (append): en cada minuto se miran únicamente los que entraron en ese paso
+    n_vistos = 0
+    for t in range(day_start, day_end):
+        ctrl.step(t, aparicion=bool(apariciones[t - day_start]))
+
+        nuevos = ctrl.inactivos[n_vistos:]
+        n_vistos = len(ctrl.inactivos)
+        for aid in nuevos:
+            estado = _nombre_estado(ctrl.planes[aid].estado)
+            if estado == 'landed':
+                landed_t[aid] = t
+            elif estado == 'diverted':
+                div_flag[aid] = True
+
+    aterrizo = landed_t >= 0
+    n_land = int(aterrizo.sum())
+    n_div  = int(div_flag.sum())
+
+    aids = np.flatnonzero(aterrizo)
+    aparicion = np.array([ctrl.planes[aid].aparicion_min for aid in aids], dtype=float)
+    delays = np.maximum(0.0, landed_t[aids] - (aparicion + T_IDEAL_100))
+
+    delay_mean = float(np.mean(delays)) if len(delays) else float('nan')
+    delay_std  = float(np.std(delays, ddof=1)) if len(delays) >= 2 else float('nan')
+    delay_se   = delay_std / math.sqrt(len(delays)) if len(delays) >= 2 else float('nan')
+
+    total_spawned = len(ctrl.planes)
+    div_rate = n_div / total_spawned if total_spawned > 0 else float('nan')
+
+    return {
+        "n_spawned": total_spawned,
+        "n_landed": n_land,
+        "n_diverted": n_div,
+        "div_rate": div_rate,
+        "delay_mean": delay_mean,
+        "delay_se": delay_se,
+    }
+
+# ---------- Multiple corridas para estimar error ----------
+def agg_metrics(metrics: List[Dict[str, float]], key: str) -> tuple[float, float]:
+    """(media, EE) de `key` entre corridas, ignorando NaN."""
+    vals = [m[key] for m in metrics if not (isinstance(m[key], float) and math.isnan(m[key]))]
+    if not vals:
+        return (float('nan'), float('nan'))
+    mean = float(np.mean(vals))
+    se   = float(np.std(vals, ddof=1)/math.sqrt(len(vals))) if len(vals) >= 2 else float('nan')
+    return (mean, se)
+
+def _init_worker(modulo: str):
+    """Se ejecuta una vez por proceso: precarga el módulo del controlador (matplotlib queda en el padre)."""
+    importlib.import_module(modulo)
+
+def _agregar(metrics: List[Dict[str, float]]) -> Dict[str, float]:
+    delay_mean, delay_mean_se = agg_metrics(metrics, "delay_mean")
+    div_rate_mean, div_rate_se = agg_metrics(metrics, "div_rate")
+    n_landed_mean, n_landed_se = agg_metrics(metrics, "n_landed")
+    n_div_mean, n_div_se       = agg_metrics(metrics, "n_diverted")
+    n_spawned_mean, _          = agg_metrics(metrics, "n_spawned")
+
+    return {
+        "delay_mean": delay_mean, "delay_mean_se": delay_mean_se,
+        "div_rate": div_rate_mean, "div_rate_se": div_rate_se,
+        "n_landed": n_landed_mean, "n_landed_se": n_landed_se,
+        "n_diverted": n_div_mean, "n_diverted_se": n_div_se,
+        "n_spawned": n_spawned_mean,
+    }
+
+def correr_varias(TA_cls, lam: float, n_runs: int, base_seed: int,
+                  day_start: int = DAY_START, day_end: int = DAY_END,
+                  ctrl_kwargs: Optional[Dict[str, Any]] = None, n_workers: int = 1) -> Dict[str, float]:
+    """
+    Corre n_runs con seeds distintos y agrega métricas (promedio + SE entre corridas).
+    n_workers > 1 reparte las corridas en procesos.
+    """
+    return correr_varias_crn(TA_cls, lam, n_runs, base_seed, [ctrl_kwargs or {}],
+                             day_start, day_end, n_workers)[0]
+
+def correr_con_mascara(TA_cls, lam: float, kwargs_list: List[Dict[str, Any]],
+                       day_start: int, day_end: int, seed: int | np.random.SeedSequence) -> List[Dict[str, float]]:
+    """Sortea las apariciones de `seed` una vez y corre cada configuración de kwargs_list con esa misma máscara."""
+    mask = mascara_apariciones(lam, seed, day_start, day_end)
+    return [correr_una_vez(TA_cls, lam, seed, day_start, day_end, kw, apariciones=mask) for kw in kwargs_list]
+
+def correr_varias_crn(TA_cls, lam: float, n_runs: int, base_seed: int, kwargs_list: List[Dict[str, Any]],
+                      day_start: int = DAY_START, day_end: int = DAY_END, n_workers: int = 1) -> List[Dict[str, float]]:
+    """
+    Como correr_varias pero para varias configuraciones del controlador a la vez (una por elemento de kwargs_list),
+    con números aleatorios comunes: la corrida k usa las mismas apariciones en todas las configuraciones,
+    así las diferencias entre configuraciones no se mezclan con el ruido del tráfico.
+    Devuelve un dict agregado por configuración, en el mismo orden.
+    """
+    # SeedSequence hijas en vez de base_seed + k: streams independientes y reproducibles
+    child_seeds = np.random.SeedSequence(base_seed).spawn(n_runs)
+    una = partial(correr_con_mascara, TA_cls, lam, kwargs_list, day_start, day_end)
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(TA_cls.__module__,)) as ex:
+            por_seed = list(ex.map(una, child_seeds))
+    else:
+        por_seed = [una(seed) for seed in child_seeds]
+
+    # por_seed[k][j] -> corrida k de la configuración j
+    return [_agregar([mets[j] for mets in por_seed]) for j in range(len(kwargs_list))]
+
+# ---------- Gráficos ----------
+def _yerr_or_none(arr):
+    return None if np.isnan(arr).all() else arr
+
+def graficar_generic(lambdas, series_by_name: Dict[str, List[Dict[str, float]]], outdir: str = "resultados", suffix: str = ""):
+    """
+    series_by_name: etiqueta -> lista de resultados de correr_varias (uno por λ, en el orden de `lambdas`).
+    Guarda delay / desvíos / aterrizajes vs λ en outdir, con `suffix` antes de la extensión.
+    """
+    import matplotlib.pyplot as plt
+
+    os.makedirs(outdir, exist_ok=True)
+    L = np.array(lambdas, dtype=float)
+    nombres = [f"delay_vs_lambda{suffix}.png", f"desvios_vs_lambda{suffix}.png", f"landings_vs_lambda{suffix}.png"]
+
+    # 1) Atraso medio ± SE
+    plt.figure(figsize=(7,5))
+    for label, hist in series_by_name.items():
+        y  = np.array([h["delay_mean"] for h in hist])
+        se = np.array([h["delay_mean_se"] for h in hist])
+        plt.errorbar(L, y, yerr=_yerr_or_none(se), marker='o', linestyle='-', label=label)
+    plt.xlabel('λ (apariciones por minuto)')
+    plt.ylabel('Atraso medio (min)')
+    plt.title('Atraso medio vs λ (±EE)')
+    plt.grid(True, alpha=0.3)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(os.path.join(outdir, nombres[0]), dpi=160)
+
+    # 2) % Desvíos ± SE
+    plt.figure(figsize=(7,5))
+    for label, hist in series_by_name.items():
+        y  = np.array([h["div_rate"] for h in hist]) * 100.0
+        se = np.array([h["div_rate_se"] for h in hist]) * 100.0
+        plt.errorbar(L, y, yerr=_yerr_or_none(se), marker='o', linestyle='-', label=label)
+    plt.xlabel('λ (apariciones por minuto)')
+    plt.ylabel('% de desvíos')
+    plt.title('Tasa de desvíos vs λ (±EE)')
+    plt.grid(True, alpha=0.3)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(os.path.join(outdir, nombres[1]), dpi=160)
+
+    # 3) Aterrizajes promedio
+    plt.figure(figsize=(7,5))
+    n = len(series_by_name)
+    width = 0.7 / n
+    idx = np.arange(len(L))
+    for k, (label, hist) in enumerate(series_by_name.items()):
+        plt.bar(idx + (k - (n - 1) / 2) * width, [h["n_landed"] for h in hist], width, label=label)
+    plt.xticks(idx, [f"{l:.2f}" for l in L])
+    plt.xlabel('λ (apariciones por minuto)')
+    plt.ylabel('Aterrizajes por día')
+    plt.title('Aterrizajes promedio vs λ')
+    plt.grid(True, axis='y', alpha=0.3)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(os.path.join(outdir, nombres[2]), dpi=160)
+
+    print(f"\nGráficos guardados en: {os.path.abspath(outdir)}")
+    for nombre in nombres:
+        print(f" - {nombre}")
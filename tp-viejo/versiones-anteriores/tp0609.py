@@ -14,12 +14,13 @@ from __future__ import annotations  # Permite anotar tipos de clases aún no def
 import matplotlib                   # Núcleo de Matplotlib para gráficos
 import numpy as np                  # Numpy para arrays/operaciones vectoriales (lo usamos en el scatter)
 from dataclasses import dataclass, field  # dataclass para definir "Avion"; 'field' no se usa aquí
-from typing import List, Dict, Optional, Tuple  # Tipado estático opcional (sólo informativo)
-import math, random                # 'random' para arribos Bernoulli; 'math' no se usa pero se mantiene igual
+from typing import Dict, Optional, Tuple  # Tipado estático opcional (sólo informativo)
+import math                         # 'math' no se usa pero se mantiene igual (los arribos salen de np.random)
 import matplotlib.pyplot as plt     # API de Matplotlib estilo MATLAB para graficar
 matplotlib.use("Agg")               # Backend no interactivo (genera archivos: PNG/GIF). Mantengo orden del original
 from matplotlib.lines import Line2D  # Para construir ítems de leyenda manualmente
-import matplotlib.animation as animation  # Para crear animaciones (GIF) con FuncAnimation
+from matplotlib.colors import to_rgba_array  # Nombres de color → tabla RGBA (para colorear por código de estado)
+from PIL import Image                # Pillow: arma el GIF con los frames dibujados
 
 
 # --------------------------------------------------
@@ -62,23 +63,42 @@ velocidades = [
 # FUNCIONES ÚTILES (cálculos de política y tiempos)
 # --------------------------------------------------
 
+# LUT por nm entero: como los bordes de las bandas (0, 5, 15, 50, 100) son enteros, para d ≥ 0 la banda de d
+# es la misma que la de int(d). Se llena una sola vez recorriendo la tabla 'velocidades'; el último lugar (100)
+# es la banda de >100 nm.
+def _armar_luts() -> Tuple[np.ndarray, np.ndarray]:
+    vmin_lut, vmax_lut = np.empty(101), np.empty(101)
+    for k in range(101):
+        for lo, hi, vmin, vmax in velocidades:  # Itero por cada banda (rango de distancia)
+            if lo <= k < hi:                    # Si el nm entero cae en [lo, hi)
+                vmin_lut[k], vmax_lut[k] = vmin, vmax
+                break
+    return vmin_lut, vmax_lut
+
+VMIN_LUT, VMAX_LUT = _armar_luts()
+_VEL_LUT = list(zip(VMIN_LUT.tolist(), VMAX_LUT.tolist()))  # lo mismo como lista de tuplas (más rápido para un solo d)
+
+
 def velocidad_por_distancia(d_nm: float) -> Tuple[float, float]:
     """Devuelve (vmin, vmax) según en qué banda cae la distancia d_nm.
-    Recorremos la tabla 'velocidades' y elegimos la primera cuyo rango contenga a d_nm.
+    En vez de recorrer la tabla 'velocidades', miramos la LUT en int(d_nm) (100 para todo lo que esté a ≥ 100 nm).
     """
-    for lo, hi, vmin, vmax in velocidades:  # Itero por cada banda (rango de distancia)
-        if lo <= d_nm < hi:                 # Si d_nm cae en [lo, hi)
-            return vmin, vmax               # Devuelvo límites de velocidad permitida en esa banda
-    # Si por alguna razón d_nm > 100 nm, caigo en la banda de 300–500 kts
-    return velocidades[0][2], velocidades[0][3]
+    if d_nm < 0.0:
+        # Fuera de toda banda: caigo en la de 300–500 kts, como hacía el recorrido de la tabla
+        return velocidades[0][2], velocidades[0][3]
+    return _VEL_LUT[int(d_nm) if d_nm < 100.0 else 100]
+
+
+# ETA de un avión parado: un número enorme pero finito (con inf, restar dos ETAs "infinitas" da NaN)
+ETA_INF = 1e9
 
 
 def eta_min(dist_nm: float, speed_kts: float) -> float:
     """ tiempo en minutos que te faltan para llegar a aep si mantuvieras esa velocidad constante.
     ETA (min) a pista si mantuvieras speed_kts constante desde dist_nm.
-    speed_kts/60 = nm/min; dist_nm / (nm/min) = min. Si speed<=0 ⇒ infinito.
+    speed_kts/60 = nm/min; dist_nm / (nm/min) = min. Si speed<=0 ⇒ ETA_INF (nunca llega).
     """
-    return float('inf') if speed_kts <= 0 else dist_nm / (speed_kts / 60.0)
+    return ETA_INF if speed_kts <= 0 else dist_nm / (speed_kts / 60.0)
 
 
 def gap_minutos(self_dist: float, self_speed: float,
@@ -89,17 +109,28 @@ def gap_minutos(self_dist: float, self_speed: float,
     return eta_min(self_dist, self_speed) - eta_min(lead_dist, lead_speed)
 
 
+# --------------------------------------------------
+# CÓDIGOS DE ESTADO (enteros en vez de strings)
+# --------------------------------------------------
+# El orden importa: los "en cola" (approach/delayed) son <= DELAYED y los que ya terminaron (diverted/landed)
+# son >= DIVERTED, así cada chequeo es una sola comparación de enteros (y entran en un array int8).
+APPROACH, DELAYED, TURNAROUND, DIVERTED, LANDED = range(5)
+STATUS_NAMES = ("approach", "delayed", "turnaround", "diverted", "landed")  # sólo para imprimir: STATUS_NAMES[código]
+COLORES_ESTADO = ("tab:blue", "tab:orange", "tab:red", "gray", "tab:green")  # color de cada código (ver color_estados)
+TABLA_RGBA = to_rgba_array(COLORES_ESTADO)  # (5, 4): fila = código de estado → RGBA (para indexar con arrays)
+
+
 # --------------------------------------------------
 # CLASE Avion: estado + regla de decisión por minuto (step)
 # --------------------------------------------------
-@dataclass
+@dataclass(slots=True)
 class Avion:
     id: int                                 # NO LO USAMOS MAS. Identificador entero autoincremental pero fijo. [ESTO NO: Convenio: líder "nominal" es id+1 (no porque si metes un avion entre otros dos tenes que cambiar los ids de todos)]
-    leader: Avion = None                    
     momento_aparicion: float                # Minuto en que aparece a 100 nm (spawn)
     distancia_a_aep: float = 100.0          # Estado: distancia restante a la pista (nm). 0 ⇒ en pista
     velocidad: float = 300.0                # Estado: velocidad actual (kts)
-    status: str = "approach"                # Estado discreto: approach|delayed|turnaround|diverted|landed
+    status: int = APPROACH                  # Estado discreto (código): APPROACH|DELAYED|TURNAROUND|DIVERTED|LANDED
+    leader: Optional[Avion] = None          # Va al final: un campo con default no puede ir antes de uno sin default
 
     def velocidad_permitida(self) -> Tuple[float, float]:
         # Wrapper útil por legibilidad (no altera lógica)
@@ -121,29 +152,29 @@ class Avion:
         """
 
         # 1) Si ya está fuera de juego (landed/diverted), no hace nada este tick
-        if self.status in ("landed", "diverted"):
+        if self.status >= DIVERTED:
             return  # corto acá porque no quiero actualizar ni velocidad ni distancia
 
         # 2) Intento obtener al "líder nominal" (id+1). Si ese líder ya no está (landed/diverted), lo ignoro
         leader = cohort.get(self.id + 1, None)  # O(1) vía diccionario
-        if leader and leader.status in ("landed", "diverted"):
+        if leader and leader.status >= DIVERTED:
             leader = None  # leader inválido, lo trato como si no hubiera
 
         # 3) Leo límites de velocidad en la banda actual (según mi distancia)
         vmin, vmax = velocidad_por_distancia(self.distancia_a_aep)
 
         # 4) Caso: estoy en turnaround (voy "hacia atrás" a 200 kts hasta ver hueco)
-        if self.status == "turnaround":
+        if self.status == TURNAROUND:
             # --- CAMBIO SOLICITADO ---
             # Ahora el reingreso NO mira sólo al viejo líder. Busca un HUECO GLOBAL ≥10 min.
 
             # 4.a) Construyo lista de aviones "activos" (descarto landed/diverted y a mí mismo).
             activos = [a for a in cohort.values()
-                    if a.id != self.id and a.status not in ("landed", "diverted", "turnaround")] #agrego turnaround para que no me considere a mi mismo ni a otros que esten volviendo 
+                    if a.id != self.id and a.status <= DELAYED] #agrego turnaround para que no me considere a mi mismo ni a otros que esten volviendo 
 
             # 4.b) Si no hay nadie activo, puedo reinsertarme sin conflicto → approach@vmax
             if not activos:
-                self.status = "approach"     # vuelvo a la cola
+                self.status = APPROACH     # vuelvo a la cola
                 self.velocidad = vmax         # retomo la velocidad máxima permitida
                 # (no hago return: dejo que más abajo se aplique el avance común "hacia adelante")
             else:
@@ -169,7 +200,7 @@ class Avion:
 
                     if (my_eta-eta1 >= 5 and eta2-my_eta >= 5):
                         # Hueco suficiente y mi ETA cabe dentro → me reinsertaría "entre" A y B
-                        self.status = "approach"  # salgo de turnaround
+                        self.status = APPROACH  # salgo de turnaround
                         self.velocidad = vmax      # aplico la misma velocidad con la que evalué el hueco
                         reingresa = True
                         break
@@ -179,7 +210,7 @@ class Avion:
                     self.velocidad = velocidad_reversa                 # 200 kts "hacia atrás"
                     self.distancia_a_aep += knots_to_nm_per_min(self.velocidad) * dt_min  # aumenta distancia
                     if self.distancia_a_aep >= 100.0:                  # si ya me fui del tubo de 100 nm
-                        self.status = "diverted"                       # se considera desvío (sale del sistema)
+                        self.status = DIVERTED                         # se considera desvío (sale del sistema)
                     return  # IMPORTANTE: ya apliqué desplazamiento; evito el avance común de cierre
 
         else:
@@ -189,7 +220,7 @@ class Avion:
             if leader is None:
                 # 5.a) Sin líder válido ⇒ no hay conflicto inmediato → approach @ vmax
                 self.velocidad = velDes
-                self.status = "approach"
+                self.status = APPROACH
             else:
                 # 5.b) Con líder: calculo gap suponiendo que YO voy a velDes y el líder mantiene su velocidad actual
                 gap = gap_minutos(self.distancia_a_aep, velDes, leader.distancia_a_aep, leader.velocidad)
@@ -203,18 +234,18 @@ class Avion:
                         # CHEQUEAR SI ESTA BIEN !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
 
                         # NO muevas ni desvíes en el mismo tick del cambio de estado
-                        self.status = "turnaround"
+                        self.status = TURNAROUND
                         self.velocidad = velocidad_reversa
                         return  # ← dejá que el movimiento/chequeo ocurra en el PRÓXIMO tick, dentro del bloque turnaround
 
                     else:
                         # 5.b.iii) Pude frenar sin violar vmin ⇒ me quedo en la cola pero marcado como delayed
                         self.velocidad = nuevaVel
-                        self.status = "delayed"
+                        self.status = DELAYED
 
                 elif gap >= gap_minimo_min:
                     # 5.b.iv) Tengo buffer cómodo (≥4 min) ⇒ approach @ vmax
-                    self.status = "approach"
+                    self.status = APPROACH
                     self.velocidad = velDes
 
         # 6) AVANCE COMÚN (aplica si no hice "return" antes: o sea, no en el tramo de turnaround sin reingreso)
@@ -225,7 +256,7 @@ class Avion:
         if self.distancia_a_aep <= 0.0:
             self.distancia_a_aep = 0.0
             self.velocidad = 0.0
-            self.status = "landed"
+            self.status = LANDED
             return  # listo: queda fuera de juego en siguientes ticks
 
         # si no aterrizó:
@@ -238,13 +269,10 @@ class Avion:
 # Generamos de manera estocástica en qué minutos aparece 1 (a lo sumo) avión nuevo.
 
 def tiempos_de_spawn(lam_per_min, t0, t1, seed=42):
-    rng = random.Random(seed)  # RNG local con semilla fija (reproducible)
-    tiempos = []               # acumulador de minutos donde hubo "éxito"
-    for i in range(t0, t1):    # recorro minutos enteros [t0, t1)
-        u = rng.random()       # U ~ Uniforme(0,1)
-        if u < lam_per_min:    # Éxito con prob λ ⇒ spawnea 1 avión en el minuto i
-            tiempos.append(i)
-    return tiempos             # lista de minutos con aparición (máx 1 por minuto)
+    rng = np.random.default_rng(seed)       # RNG local con semilla fija (reproducible)
+    u = rng.random(t1 - t0)                 # U ~ Uniforme(0,1), una por minuto de [t0, t1), todas de una vez
+    exito = u < lam_per_min                 # Éxito con prob λ ⇒ spawnea 1 avión en ese minuto
+    return (np.flatnonzero(exito) + t0).tolist()  # lista de minutos con aparición (máx 1 por minuto)
 
 
 # --------------------------------------------------
@@ -253,77 +281,236 @@ def tiempos_de_spawn(lam_per_min, t0, t1, seed=42):
 # Nota: mantenemos los colores del original (incluye 'tab:pink' para diverted).
 
 def color_estados(estado):
-    return {
-        "approach":   "tab:blue",
-        "delayed":    "tab:orange",
-        "turnaround": "tab:red",
-        "diverted":   "gray",        # ← usa un color real
-        "landed":     "tab:green",   # ← si agregaste el estado landed, dale color
-    }.get(estado, "gray")            # ← default SIEMPRE un color válido
+    # estado es un código (APPROACH..LANDED): el color sale de indexar la tupla, sin armar un dict por llamada
+    return COLORES_ESTADO[estado] if 0 <= estado < len(COLORES_ESTADO) else "gray"  # ← default SIEMPRE un color válido
 
 
 
 # --------------------------------------------------
-# SIMULACIÓN PRINCIPAL (time-stepped)
+# FLOTA EN ARRAYS (SoA): la misma regla de Avion.step pero para todos los aviones a la vez
 # --------------------------------------------------
-# Recorre minuto a minuto: spawnea con Bernoulli, hace step() por avión, guarda frames.
-
-def simular(lam, t_inicio, t_final, seed = 42):
-    rng = random.Random(seed)  # Se crea RNG pero no se usa aquí (se mantiene igual al original)
+# En vez de una lista de objetos Avion, el estado vive en arrays paralelos indexados por orden de aparición:
+# el avión i tiene id -(i+1), así que su "líder nominal" (id+1) es simplemente el i-1.
+
+def velocidades_por_distancia(d_nm: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Versión vectorizada de velocidad_por_distancia: (vmin, vmax) para cada distancia (≥ 0) del array."""
+    i = np.minimum(d_nm, 100.0).astype(np.intp)  # nm entero, con todo lo de ≥ 100 nm en el último lugar de la LUT
+    return VMIN_LUT[i], VMAX_LUT[i]
+
+
+def paso_flota(dist: np.ndarray, vel: np.ndarray, status: np.ndarray, n: int,
+               dt_min: float = 1.0,
+               gap_minimo_min: float = separacion_minima,
+               gap_reingreso_min: float = 10.0) -> None:
+    """Un tick para los n primeros aviones, modificando los arrays in-place.
+    Los arrays pueden tener ejes extra adelante (B, N): cada fila es una corrida independiente (ver simular_batch).
+    Reproduce exactamente el loop de simular con step() por id ascendente (el más nuevo primero):
+        - Caso normal: el líder (i-1) se mueve DESPUÉS que i, así que i siempre ve el estado del tick anterior
+          de su líder ⇒ todos los casos normales se resuelven juntos con operaciones vectoriales.
+        - Turnaround: mira a todos los activos, con estado nuevo los que ya se movieron (índice mayor) y viejo
+          los que todavía no (índice menor) ⇒ se resuelve avión por avión, del más nuevo al más viejo (son pocos).
+    """
+    d0, v0, st0 = dist[..., :n].copy(), vel[..., :n].copy(), status[..., :n].copy()  # estado del tick anterior
+    d, v, st = dist[..., :n], vel[..., :n], status[..., :n]                           # vistas: acá escribo el nuevo
+    vmin, vmax = velocidades_por_distancia(d0)                           # límites de la banda de cada uno
+
+    # Líder nominal = el anterior en el array, si sigue en juego (ni landed ni diverted)
+    # (el índice del líder es siempre i-1: se lee corriendo los arrays un lugar; si el líder ya terminó, el avión
+    #  queda sin líder, igual que en step())
+    con_lider = np.zeros(d0.shape, dtype=bool)
+    con_lider[..., 1:] = st0[..., :-1] < DIVERTED
+    lead_d = np.empty(d0.shape); lead_d[..., 0] = 0.0; lead_d[..., 1:] = d0[..., :-1]
+    lead_v = np.ones(d0.shape);  lead_v[..., 1:] = v0[..., :-1]  # (el 1 del primero es para no dividir por 0: no tiene líder)
+
+    # 5) Caso normal (approach/delayed): gap si yo voy a vmax y el líder sigue como venía
+    normal = st0 <= DELAYED
+    lead_eta = np.full(d0.shape, ETA_INF)                 # líderes landed tienen v=0: ETA_INF (igual quedan afuera
+    np.divide(lead_d, lead_v / 60.0, out=lead_eta, where=lead_v > 0)  # por con_lider), así no hay inf ni NaN
+    gap = d0 / (vmax / 60.0) - lead_eta
+    cerca = normal & con_lider & (gap < gap_minimo_min)  # 5.b.i) a menos de 4 min
+    nueva_vel = np.minimum(vmax, lead_v - 20.0)          # intento ir 20 kts por debajo del líder
+    a_turnaround = cerca & (nueva_vel < vmin)            # 5.b.ii) no puedo sin bajar de vmin ⇒ turnaround (sin moverme)
+    demorado = cerca & ~a_turnaround                     # 5.b.iii) pude frenar ⇒ delayed
+    avanza = normal & ~a_turnaround                      # el resto (sin líder o gap ≥ 4) ⇒ approach @ vmax
+
+    v[avanza] = np.where(demorado, nueva_vel, vmax)[avanza]
+    st[avanza] = np.where(demorado, DELAYED, APPROACH)[avanza]
+    st[a_turnaround] = TURNAROUND
+    v[a_turnaround] = velocidad_reversa
+
+    # 6) Avance común de los normales (antes que los turnaround, que tienen que verlos ya movidos)
+    _avanzar(d, v, st, avanza, dt_min)
+
+    # 4) Turnaround, del más nuevo (índice mayor) al más viejo; cada fila (corrida) por separado
+    for *fila, k in np.argwhere(st0 == TURNAROUND)[::-1]:
+        fila = tuple(fila)  # () si es una sola corrida (arrays 1D): indexar con () da el array entero
+        _paso_turnaround(d0[fila], v0[fila], st0[fila], d[fila], v[fila], st[fila], vmax[fila], k,
+                         dt_min, gap_reingreso_min)
+
+
+def _paso_turnaround(d0, v0, st0, d, v, st, vmax, k, dt_min, gap_reingreso_min):
+    """Regla de turnaround (paso 4 de step) para el avión k de UNA corrida; escribe en las vistas d, v, st."""
+    st_vistos = np.concatenate((st0[:k], st[k+1:]))  # índice menor: tick anterior; mayor: ya movidos
+    activos = st_vistos <= DELAYED                     # descarto landed/diverted/turnaround
+    reingresa = False
+    if not activos.any():
+        reingresa = True                               # 4.b) nadie activo ⇒ vuelvo a approach @ vmax
+    else:
+        d_vistos = np.concatenate((d0[:k], d[k+1:]))[activos]
+        v_vistos = np.concatenate((v0[:k], v[k+1:]))[activos]
+        etas = np.sort(d_vistos / (v_vistos / 60.0))   # 4.c) ETAs de los activos en orden de llegada
+        my_eta = d0[k] / (vmax[k] / 60.0)              # 4.d) mi ETA si reingreso a vmax
+        # 4.e) El recorrido de pares de step corta en el primer hueco ≥ 10 min y sólo reingresa en el par (A,B)
+        #      con eta(A) ≤ my_eta < eta(B): en vez de recorrer todos, busco ese par con searchsorted y miro
+        #      si quedo a ≥ 5 min de los dos y si antes (o en ese mismo par) no había un hueco ≥ 10 que cortara
+        q = np.searchsorted(etas, my_eta, side="right") - 1
+        if 0 <= q < len(etas) - 1:
+            corta_antes = (np.diff(etas[:q + 2]) >= gap_reingreso_min).any()
+            reingresa = (not corta_antes) and my_eta - etas[q] >= 5 and etas[q + 1] - my_eta >= 5
+
+    if reingresa:
+        st[k] = APPROACH
+        v[k] = vmax[k]
+        _avanzar(d, v, st, k, dt_min)
+    else:
+        # 4.f) sigo alejándome a 200 kts; si paso de 100 nm ⇒ diverted
+        v[k] = velocidad_reversa
+        d[k] = d0[k] + knots_to_nm_per_min(velocidad_reversa) * dt_min
+        if d[k] >= 100.0:
+            st[k] = DIVERTED
+
+
+def _avanzar(d, v, st, cuales, dt_min):
+    """Avance común hacia AEP de los aviones indicados (máscara o índice); los que llegan a 0 quedan landed."""
+    d[cuales] = np.maximum(0.0, d[cuales] - v[cuales] / 60.0 * dt_min)
+    llego = np.zeros(d.shape, dtype=bool)
+    llego[cuales] = d[cuales] <= 0.0
+    d[llego] = 0.0
+    v[llego] = 0.0
+    st[llego] = LANDED
 
-    # Convención de ids: decrecientes (…,-3,-2,-1). El de id más "grande" (-1) suele estar más cerca.
-    prox_avion_id = 0  # arrancamos en 0 y vamos decrementando al spawnear
 
-    vuelos_activos: List[Avion] = []          # lista con todos los objetos Avion ACTIVOS
-    map_id_av: Dict[int, Avion] = {}     # diccionario id→Avion para acceso O(1)
+# --------------------------------------------------
+# SIMULACIÓN PRINCIPAL (time-stepped)
+# --------------------------------------------------
+# Recorre minuto a minuto: spawnea con Bernoulli, hace un paso_flota para todos, guarda frames.
 
-    spawns = set(tiempos_de_spawn(lam, t_inicio, t_final, seed))  # set de minutos con spawn para testear en O(1)
+def simular(lam, t_inicio, t_final, seed = 42):
+    # Máscara de spawns: llega[j] dice si en el minuto t_inicio + j aparece un avión (en vez de un set de minutos)
+    llega = np.zeros(t_final - t_inicio, dtype=bool)
+    llega[np.asarray(tiempos_de_spawn(lam, t_inicio, t_final, seed), dtype=np.intp) - t_inicio] = True
+
+    # Estado de la flota en arrays (a lo sumo aparece un avión por minuto con llegada)
+    # Convención de ids: el avión i tiene id -(i+1) (decrecientes: …,-3,-2,-1), el -1 suele estar más cerca.
+    # Los arrays quedan ordenados por id sin ordenar nunca nada: "id ascendente" es recorrer los índices al revés.
+    n_max = int(llega.sum())
+    dist = np.empty(n_max)                    # distancia a AEP (nm)
+    vel = np.empty(n_max)                     # velocidad (kts)
+    status = np.empty(n_max, dtype=np.int8)   # código de estado (APPROACH, DELAYED, ...)
+    n = 0                                     # cuántos aparecieron hasta ahora
+    lo = 0                                    # todos los de índice < lo ya aterrizaron o se desviaron
 
     # Estructuras sólo para la visual (asignar "carriles" verticales en el gráfico)
     lanes: Dict[int, int] = {}
-    lane_counter = 0
     lane_step = 1.2  # separación vertical entre carriles (arbitraria, puramente estética)
 
-    frames = []  # acumulador de fotogramas (xs, ys, cs) por minuto observado
-
-    for t in range(t_inicio, t_final):  # bucle de tiempo discreto (minutos enteros)
-
-        # 1) Spawns: si este minuto pertenece al set, aparece EXACTAMENTE 1 avión a 100 nm
-        if t in spawns:
-            prox_avion_id -= 1                                   # asigno nuevo id decreciente 
-            #todo. ME TENGO QUE ASEGURAR QUE EL ID NO CAMBIE NUNCA. QUE SEA UNICO Y FIJO. LO USO SOLO PARA EL MAPEO
-            av = Avion(prox_avion_id, t, 100.0, 300.0, "approach")  # objeto Avion inicializado
-            if vuelos_activos:
-                av.leader = vuelos_activos[-1]                          
-            vuelos_activos.append(av)                                     # lo agrego a la lista
-            map_id_av[av.id] = av                                    # y al diccionario para lookup
-            lanes[av.id] = lane_counter                           # le asigno un "carril" (línea visual) único
-            lane_counter += 1                                     # preparo el carril para el próximo
-
-        # 2) Dinámica: actualizo TODOS los aviones, uno por uno, ordenados por id ascendente
-        #    (seguidores primero, líderes después), de modo que cada uno decida con el estado
-        #    del tick anterior de su líder (actualización "sincrónica" limpia).
-        for f in sorted(vuelos_activos, key=lambda a: a.id):
-            f.step(cohort=map_id_av, dt_min=1.0)
+    # Frames como arrays (una fila por minuto observado): en cada fila sólo valen las primeras cuantos[i] columnas
+    n_frames = max(0, t_final - max(t_inicio, 0))
+    offsets = np.zeros((n_frames, n_max, 2))         # (x, y) de cada avión por frame, listo para set_offsets
+    offsets[:, :, 1] = np.arange(n_max) * lane_step  # el carril no cambia: la columna y se llena una sola vez
+    estados = np.zeros((n_frames, n_max), dtype=np.int8)  # código de estado por frame (el color sale de TABLA_RGBA
+                                                          # al dibujar: 1 byte por avión en vez de 4 floats)
+    cuantos = np.zeros(n_frames, dtype=np.intp)      # cuántos aviones hay en cada frame
+    fila = 0                                         # próxima fila de frame a escribir
+
+    # bucle de tiempo discreto (minutos enteros); la máscara se recorre como lista (leer un bool de numpy por
+    # índice en cada vuelta es más lento que el set)
+    for t, hay_spawn in zip(range(t_inicio, t_final), llega.tolist()):
+
+        # 1) Spawns: si en este minuto hay llegada, aparece EXACTAMENTE 1 avión a 100 nm
+        if hay_spawn:
+            dist[n], vel[n], status[n] = 100.0, 300.0, APPROACH
+            lanes[-(n + 1)] = n                   # carril = orden de aparición
+            n += 1
+
+        # 2) Dinámica: un tick para los que siguen en juego (mismo resultado que step() por id ascendente).
+        #    Sólo miro la ventana [lo, n): los anteriores ya terminaron, no se mueven, no son líder de nadie que siga
+        #    (el líder de lo es lo-1, que ya terminó) y no cuentan como activos para el reingreso.
+        #    Si no queda nadie en juego (lo == n: warmup sin llegadas o ratos vacíos) el tick no hace nada.
+        if lo < n:
+            paso_flota(dist[lo:n], vel[lo:n], status[lo:n], n - lo, dt_min=1.0)  # vistas: escribe en los arrays
+            while lo < n and status[lo] >= DIVERTED:  # corro el inicio de la ventana sobre los que terminaron
+                lo += 1
 
         # 3) Captura visual (frames): sólo desde t>=0 (si hubo warmup con t<0 no lo guardo)
         if t >= 0:
-            xs, ys, cs = [], [], []                    # listas para distancias, carriles y colores
-            for v in vuelos_activos:                           # recorro todos los aviones vivos
-                xs.append(max(0.0, min(x_max, v.distancia_a_aep)))  # capeo distancia a [0, x_max] por estética
-                ys.append(lanes[v.id] * lane_step)                  # ubico en su carril vertical
-                cs.append(color_estados(v.status))                  # color según su estado
-            frames.append((xs, ys, cs))               # guardo un frame con los 3 vectores
+            np.clip(dist[:n], 0.0, x_max, out=offsets[fila, :n, 0])  # capeo distancia a [0, x_max] por estética
+            estados[fila, :n] = status[:n]                            # estado de cada uno (define el color)
+            cuantos[fila] = n
+            fila += 1
+
+    frames = (offsets, estados, cuantos)  # el frame i son las filas offsets[i, :cuantos[i]] y estados[i, :cuantos[i]]
 
     return frames, lanes  # devuelvo frames para la animación y el mapeo id→carril
 
 
+# --------------------------------------------------
+# CORRIDAS EN LOTE (barridos de λ / semillas)
+# --------------------------------------------------
+# B corridas independientes avanzan juntas: los arrays de estado son (B, N_max) y paso_flota los procesa fila
+# por fila con las mismas operaciones vectoriales, así el costo de Python por minuto se paga una vez para las B.
+
+def simular_batch(lams, t_inicio, t_final, seeds=42):
+    """Corre simular (sin frames) para cada λ de lams a la vez. seeds: lista (una por corrida) o un entero maestro
+    del que salen semillas independientes con SeedSequence.spawn. La fila b da lo mismo que
+    simular(lams[b], t_inicio, t_final, seeds[b]).
+    Devuelve (dist, vel, status, cuantos) al final del día: en la fila b sólo valen las primeras cuantos[b] columnas.
+    """
+    B = len(lams)
+    if np.isscalar(seeds):
+        seeds = np.random.SeedSequence(seeds).spawn(B)  # un stream independiente por corrida
+
+    # Spawns de cada corrida como fila de una matriz booleana (B, minutos)
+    llega = np.zeros((B, t_final - t_inicio), dtype=bool)
+    for b in range(B):
+        llega[b, np.asarray(tiempos_de_spawn(lams[b], t_inicio, t_final, seeds[b]), dtype=np.intp) - t_inicio] = True
+
+    # Estado en (B, N_max). Los lugares todavía sin avión quedan LANDED (d=0, v=0): paso_flota los ignora igual que
+    # a uno que ya terminó (no son normales, no son activos y no son líder de nadie que siga en juego)
+    total = llega.sum(axis=1)              # cuántos aviones aparecen en todo el día en cada corrida
+    n_max = int(total.max(initial=0))
+    dist = np.zeros((B, n_max))
+    vel = np.zeros((B, n_max))
+    status = np.full((B, n_max), LANDED, dtype=np.int8)
+    cuantos = np.zeros(B, dtype=np.intp)   # cuántos aparecieron en cada corrida
+    lo = 0                                 # columnas < lo ya terminaron en TODAS las corridas
+
+    for j in range(t_final - t_inicio):
+        filas = np.flatnonzero(llega[:, j])  # corridas con spawn en este minuto
+        if len(filas):
+            dist[filas, cuantos[filas]] = 100.0
+            vel[filas, cuantos[filas]] = 300.0
+            status[filas, cuantos[filas]] = APPROACH
+            cuantos[filas] += 1
+
+        hi = int(cuantos.max(initial=0))
+        if lo < hi:
+            paso_flota(dist[:, lo:hi], vel[:, lo:hi], status[:, lo:hi], hi - lo, dt_min=1.0)
+            # Corro lo sobre una columna si en cada corrida ya terminó, o si esa corrida nunca llega a tener tantos
+            # aviones (si no, uno que aparezca después en esa columna quedaría fuera de la ventana)
+            while lo < hi and ((status[:, lo] >= DIVERTED) & ((cuantos > lo) | (total <= lo))).all():
+                lo += 1
+
+    return dist, vel, status, cuantos
+
+
 # --------------------------------------------------
 # VISUALIZACIÓN: guardar GIF de la evolución de la cola
 # --------------------------------------------------
 # Construye un scatter animado (x=distancia, y=carril, color=estado).
 
 def save_gif_frames(frames, lanes, out_path="sim_ej1.gif", fps=10):
+    """Dibuja los frames de simular uno por uno y guarda el GIF con Pillow (sin FuncAnimation ni PillowWriter)."""
     fig, ax = plt.subplots(figsize=(10, 5))       # creo figura y ejes con tamaño 10x5 pulgadas
     ax.set_xlim(0, x_max)                         # eje X entre 0 y x_max nm
     ax.set_ylim(-1, max(2, len(lanes)) * 1.2)     # eje Y dinámico según cantidad de carriles
@@ -331,6 +518,8 @@ def save_gif_frames(frames, lanes, out_path="sim_ej1.gif", fps=10):
     ax.set_xlabel("Distancia a AEP (nm)")        # etiqueta eje X
     ax.set_ylabel("Pista visual por avión")      # etiqueta eje Y
 
+    offsets, estados, cuantos = frames            # arrays precalculados por simular (ver ahí)
+
     scat = ax.scatter([], [])                     # creo un scatter vacío (se llenará en cada frame)
     scat.set_offsets(np.empty((0, 2)))            # inicializo offsets (N×2) a matriz vacía
 
@@ -346,33 +535,19 @@ def save_gif_frames(frames, lanes, out_path="sim_ej1.gif", fps=10):
 
     ax.legend(handles=legend_handles, loc="upper right")  # muestro la leyenda arriba a la derecha
 
-    def init():
-        # Función de inicialización para FuncAnimation: limpia offsets y colores
-        scat.set_offsets(np.empty((0, 2)))  # sin puntos
-        scat.set_color([])                  # sin colores
-        return (scat,)
-
-    def update(i):
-        # Función que dibuja el frame i-ésimo: coloca los puntos y setea colores
-        xs, ys, cs = frames[i]             # recupero los vectores del frame i
-        if xs:                             # si hay puntos en este frame
-            offs = np.column_stack([xs, ys])  # construyo matriz N×2 con columnas (x,y)
-            scat.set_offsets(offs)            # actualizo posiciones
-            scat.set_color(cs)                # actualizo colores por estado
-        else:                             
-            scat.set_offsets(np.empty((0, 2)))  # frame sin puntos
-            scat.set_color([])
-        ax.set_title(f"Aproximaciones – t = {i} min")  # título dinámico con el minuto
-        return (scat,)                                 # devuelvo el artista actualizado
-
-    # Creo la animación: llama a update(i) para i=0..len(frames)-1
-    anim = animation.FuncAnimation(
-        fig, update, init_func=init,
-        frames=len(frames), interval=1000 / fps, blit=True
-    )
+    colores = np.empty((offsets.shape[1], 4))     # buffer de colores armado una sola vez (se pisan las primeras k filas)
+    imgs = []
     try:
-        writer = animation.PillowWriter(fps=fps)  # escritor GIF basado en Pillow
-        anim.save(out_path, writer=writer)        # guardo en disco el GIF final
+        for i, k in enumerate(cuantos):
+            scat.set_offsets(offsets[i, :k])      # posiciones: rebanada contigua (k×2), sin armar listas
+            np.take(TABLA_RGBA, estados[i, :k], axis=0, out=colores[:k])  # código → RGBA indexando la tabla
+            scat.set_color(colores[:k])           # colores por estado
+            ax.set_title(f"Aproximaciones – t = {i} min")  # título dinámico con el minuto
+
+            # Un solo draw por frame y leo el buffer RGBA del canvas directo (anim.save dibujaba cada frame dos veces)
+            fig.canvas.draw()
+            imgs.append(Image.fromarray(np.asarray(fig.canvas.buffer_rgba())).convert("RGB"))
+        imgs[0].save(out_path, save_all=True, append_images=imgs[1:], duration=int(1000 / fps), loop=0)  # GIF final
         print(f"GIF guardado en {out_path}")
     finally:
         plt.close(fig)  # cierro la figura para liberar memoria/recursos
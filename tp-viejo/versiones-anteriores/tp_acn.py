@@ -1,10 +1,12 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple
-import math, random
-import matplotlib.pyplot as plt
-from matplotlib.lines import Line2D
-import matplotlib.animation as animation
+import math
+import numpy as np
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+# matplotlib se importa adentro de las funciones del GIF: las corridas de Monte Carlo no lo cargan
 
 MINUTE = 1.0
 
@@ -16,6 +18,7 @@ def knots_to_nm_per_min(k: float) -> float: return k / 60.0  # nm/min
 separacion_minima = 4.0  # min
 separacion_target = 5.0  # min (buffer)
 velocidad_reversa = 200.0  # kts (hacia atrás)
+reversa_nm_por_min = velocidad_reversa / 60.0  # lo que se aleja por minuto en backtrack (constante: se divide una vez)
 apertura_aep_min = 6*60
 cierre_aep_min = 24*60  # medianoche (medimos desde 00:00)
 minutos_del_dia = cierre_aep_min - apertura_aep_min  # 1080 min
@@ -30,15 +33,33 @@ velocidades = [
     (0.0, 5.0, 120.0, 150.0),
 ]
 
+# Bandas ordenadas por borde inferior: _BORDES[i] es el borde inferior de la banda i y _VTABLA[i] = (vmin, vmax)
+_BANDAS = sorted(velocidades)
+_BORDES = [lo for lo, hi, vmin, vmax in _BANDAS]                    # [0, 5, 15, 50, 100]
+_VTABLA_L = [(vmin, vmax) for lo, hi, vmin, vmax in _BANDAS]
+_UMBRALES = np.array(_BORDES[1:])                                   # cortes entre bandas: [5, 15, 50, 100]
+_VTABLA = np.array(_VTABLA_L)                                       # (5, 2)
+
 def velocidad_por_distancia(d_nm: float) -> Tuple[float, float]:
-    for lo, hi, vmin, vmax in velocidades:
-        if lo <= d_nm < hi:
-            return vmin, vmax
-    # si está más allá de 100 nm:
-    return velocidades[0][2], velocidades[0][3]
+    # búsqueda binaria sobre los bordes inferiores (lo <= d_nm < hi)
+    i = bisect_right(_BORDES, d_nm) - 1
+    if i < 0:
+        # fuera de las bandas: la más lejana (como el recorrido original)
+        return velocidades[0][2], velocidades[0][3]
+    return _VTABLA_L[i]
+
+# tabla por nm entero 0..100: los bordes son enteros, así que la banda de d es la de int(d) (y de 100 en adelante, la de 100)
+_BANDA_POR_NM = np.searchsorted(_UMBRALES, np.arange(101), side="right")
+_VMIN_POR_NM = _VTABLA[_BANDA_POR_NM, 0]
+_VMAX_POR_NM = _VTABLA[_BANDA_POR_NM, 1]
+
+def velocidades_por_distancia(d_nm: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Versión vectorizada de velocidad_por_distancia para un array de distancias (>= 0): (vmin, vmax) de cada una."""
+    k = np.minimum(d_nm, 100.0).astype(np.intp)
+    return _VMIN_POR_NM[k], _VMAX_POR_NM[k]
 
 
-@dataclass
+@dataclass(slots=True)
 class Avion:
     id: int
     momento_aparicion: float  # minuto en que aparece a 100 nm
@@ -48,7 +69,7 @@ class Avion:
     instante_aterrizaje: Optional[float] = None
     eta_base: Optional[float] = None  # ETA sin congestión (para demora base)
     sufrio_congestion: bool = False
-    historial: List[Tuple[float, float, float, str, bool]] = field(default_factory=list)  # (t, distancia_a_aep, velocidad)
+    # (el historial minuto a minuto ya no va por avión: está en los arrays hist_* de la Fleet, ver SimResult.flota)
 
     def velocidad_permitida(self) -> Tuple[float, float]:
         return velocidad_por_distancia(self.distancia_a_aep)
@@ -56,16 +77,16 @@ class Avion:
     def step(self, dt_min: float, open_runway: bool) -> None:
         """Avanza posición en nm según `velocidad` y actualiza estado de aterrizaje si corresponde."""
         if self.status == "approach":
-            self.distancia_a_aep = max(0.0, self.distancia_a_aep - knots_to_nm_per_min(self.velocidad) * dt_min)
-            if self.distancia_a_aep == 0.0 and open_runway:
+            nueva = self.distancia_a_aep - self.velocidad / 60.0 * dt_min
+            self.distancia_a_aep = nueva if nueva > 0.0 else 0.0
+            if nueva <= 0.0 and open_runway:  # (llegó a 0: se decide con la distancia sin recortar)
                 self.status = "landed"
         elif self.status == "backtrack":
             # se aleja del aeropuerto
-            self.distancia_a_aep += knots_to_nm_per_min(velocidad_reversa) * dt_min
+            self.distancia_a_aep += reversa_nm_por_min * dt_min
             if self.distancia_a_aep > 100.0:
                 self.status = "diverted"
         # otros estados no mueven (diverted/landed)
-        self.historial.append((self.momento_aparicion + len(self.historial)*dt_min, self.distancia_a_aep, self.velocidad, self.status, self.sufrio_congestion))
 
 
 def free_flow_eta_minutes() -> float:
@@ -87,19 +108,126 @@ def free_flow_eta_minutes() -> float:
 FREE_FLOW_ETA = free_flow_eta_minutes()
 
 
-@dataclass
+# Estados como códigos enteros (para guardarlos en arrays); STATUS_NAMES[código] da el string de siempre
+APPROACH, BACKTRACK, DIVERTED, LANDED, GOAROUND = range(5)
+STATUS_NAMES = ("approach", "backtrack", "diverted", "landed", "goaround")
+
+
+class Fleet:
+    """Estado de todos los aviones del día en arrays paralelos (Structure of Arrays): el avión i tiene id i+1.
+    Hace lo mismo que una lista de Avion con step(), pero el avance de todos es una operación de numpy.
+    Si record_history, también guarda el historial de cada minuto en arrays (fila = minuto, columna = avión).
+    """
+
+    def __init__(self, spawns: np.ndarray, n_pasos: int, record_history: bool = False):
+        n = len(spawns)
+        self.n = n
+        self.spawn = np.asarray(spawns, dtype=float)
+        self.dist = np.full(n, 100.0)
+        self.vel = np.full(n, 300.0)
+        self.status = np.full(n, APPROACH, dtype=np.int8)
+        self.eta_base = self.spawn + FREE_FLOW_ETA  # ETA sin congestión (para demora base)
+        self.congested = np.zeros(n, dtype=bool)
+        self.instante_aterrizaje = np.full(n, np.nan)  # nan = todavía no aterrizó
+        self.activos = np.arange(n)  # ids-1 en approach/backtrack, en orden de id (ver actualizar_activos)
+        # historial: una fila por llamada a step (sin historial no se reserva nada)
+        if not record_history:
+            n_pasos = 0
+        self.record_history = record_history
+        self.hist_dist = np.empty((n_pasos, n))
+        self.hist_vel = np.empty((n_pasos, n))
+        self.hist_status = np.empty((n_pasos, n), dtype=np.int8)
+        self.hist_congested = np.empty((n_pasos, n), dtype=bool)
+        self.n_hist = 0
+
+    def step(self, dt_min: float, open_runway: bool) -> None:
+        """Avion.step para todos a la vez: approach avanza (y aterriza en 0 si la pista está abierta), backtrack se aleja."""
+        # sólo los activos: los landed/diverted no se mueven
+        st = self.status[self.activos]
+        app = self.activos[st == APPROACH]
+        back = self.activos[st == BACKTRACK]
+        nueva = self.dist[app] - self.vel[app] / 60.0 * dt_min
+        self.dist[app] = np.maximum(0.0, nueva)
+        if open_runway:
+            self.status[app[nueva <= 0.0]] = LANDED  # llegó a 0 (sin volver a leer dist[app])
+        self.dist[back] += reversa_nm_por_min * dt_min
+        self.status[back[self.dist[back] > 100.0]] = DIVERTED
+        # otros estados no mueven (diverted/landed)
+        if not self.record_history:
+            return
+        k = self.n_hist
+        self.hist_dist[k] = self.dist
+        self.hist_vel[k] = self.vel
+        self.hist_status[k] = self.status
+        self.hist_congested[k] = self.congested
+        self.n_hist += 1
+
+    def actualizar_activos(self) -> None:
+        """Saca de activos a los que terminaron (landed/diverted). Se llama al final de cada minuto: ahí ninguno
+        vuelve a approach después (los holds y go-arounds se resuelven dentro del mismo minuto)."""
+        self.activos = self.activos[self.status[self.activos] <= BACKTRACK]
+
+    def registro(self, i: int, k: int, dt_min: float = 1.0) -> Tuple[float, float, float, str, bool]:
+        """Fila k del historial del avión i como (t, distancia_a_aep, velocidad, status, congestionado)."""
+        return (int(self.spawn[i]) + k*dt_min, float(self.hist_dist[k, i]), float(self.hist_vel[k, i]),
+                STATUS_NAMES[self.hist_status[k, i]], bool(self.hist_congested[k, i]))
+
+    def to_aviones(self) -> List[Avion]:
+        """Arma la lista de Avion (estado final de cada uno) que devuelve SimResult, a partir de los arrays."""
+        aviones = []
+        for i in range(self.n):
+            t_sp = int(self.spawn[i])
+            inst = float(self.instante_aterrizaje[i])
+            aviones.append(Avion(
+                id=i+1, momento_aparicion=t_sp,
+                distancia_a_aep=float(self.dist[i]), velocidad=float(self.vel[i]),
+                status=STATUS_NAMES[self.status[i]],
+                instante_aterrizaje=None if math.isnan(inst) else inst,
+                eta_base=float(self.eta_base[i]),
+                sufrio_congestion=bool(self.congested[i]),
+            ))
+        return aviones
+
+
+@dataclass(slots=True)
 class SimResult:
     flights: List[Avion]
     metrics: Dict[str, float]
     timeline_landings: List[float]
+    flota: Optional[Fleet] = None  # arrays de la simulación, con el historial por minuto si se corrió con record_history
 
-def bernoulli_arrivals(lam_per_min: float, t0: int, t1: int, rng: random.Random) -> List[int]:
-    """Devuelve minutos (enteros) en [t0, t1) donde aparece 1 avión a 100 nm (proceso Bernoulli por minuto)."""
-    times = []
-    for t in range(t0, t1):
-        if rng.random() < lam_per_min:
-            times.append(t)
-    return times
+def bernoulli_arrivals(lam_per_min: float, t0: int, t1: int, rng: np.random.Generator) -> np.ndarray:
+    """Devuelve minutos (enteros) en [t0, t1) donde aparece 1 avión a 100 nm (proceso Bernoulli por minuto).
+    Sortea los t1-t0 uniformes de una sola vez con numpy en vez de un rng.random() por minuto; queda como array
+    (Fleet los guarda en un array igual).
+    """
+    u = rng.random(t1 - t0)
+    return np.nonzero(u < lam_per_min)[0] + t0
+
+
+def velocidades_en_cola(d: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Velocidades de una cola ordenada por distancia (d[0] el más cercano, ninguno en backtrack).
+    Cada uno va a su vmax salvo que el gap tosco con el de adelante (ya con su velocidad nueva) sea < separacion_minima:
+    ahí baja a max(vmin, v_lider - 20) (o pasa a backtrack si eso no le da). Devuelve (vels, cerca, a_backtrack),
+    las máscaras para d[1:].
+    En vez de recorrer la cola avión por avión, se aplica la regla a todos con las velocidades de la vuelta anterior
+    hasta que no cambia nada: como cada uno depende sólo del de adelante el punto fijo es el mismo que da el
+    recorrido en orden, y se llega en pocas vueltas porque las velocidades topan enseguida con el vmin de la banda.
+    """
+    vmin, vmax = velocidades_por_distancia(d)
+    t_self = d[1:] / (vmax[1:] / 60.0)  # tiempo restante estimado (min) = d / (v_nm/min)
+    vels = vmax.copy()
+    while True:
+        lead_v = vels[:-1]
+        gap = t_self - d[:-1] / (lead_v / 60.0)
+        cerca = gap < separacion_minima
+        # regla: el follower baja 20 kts vs el líder hasta lograr >=5 min
+        candidate = np.minimum(vmax[1:], np.maximum(vmin[1:], lead_v - 20.0))
+        a_backtrack = cerca & (candidate < vmin[1:])  # congestión fuerte: entra en backtrack
+        nuevas = np.where(cerca, np.where(a_backtrack, velocidad_reversa, candidate), vmax[1:])
+        if np.array_equal(nuevas, vels[1:]):
+            return vels, cerca, a_backtrack
+        vels[1:] = nuevas
 
 
 def simulate_day(
@@ -109,135 +237,260 @@ def simulate_day(
     windy: bool = False,
     closure_minute: Optional[int] = None,
     closure_duration: int = 30,
+    record_history: bool = False,
 ) -> SimResult:
     """
     Simula desde 06:00 hasta medianoche (t = 0..day_minutes).
     - lam: probabilidad por minuto de nuevo avión.
     - windy: cada aterrizaje tiene 10% de go-around (reinserción sencilla).
     - closure_minute: si no es None, cierra pista [closure_minute, closure_minute+closure_duration).
+    - record_history: guardar el historial minuto a minuto de cada avión (lo necesita save_gif_visualizacion;
+      para corridas de Monte Carlo conviene dejarlo apagado).
     """
-    rng = random.Random(seed)
+    rng = np.random.default_rng(seed)
     t0, t1 = 0, day_minutes
     spawns = bernoulli_arrivals(lam, t0, t1, rng)
 
-    flights: List[Avion] = []
-    for i, t in enumerate(spawns):
-        ac = Avion(id=i+1, momento_aparicion=t, distancia_a_aep=100.0, velocidad=300.0, status="approach")
-        ac.eta_base = t + FREE_FLOW_ETA
-        flights.append(ac)
+    fleet = Fleet(spawns, t1 - t0 + 1, record_history)
+
+    # viento: un sorteo por aterrizaje y aterriza a lo sumo uno por minuto, así que alcanzan t1-t0+1; se sacan todos
+    # juntos del mismo Generator (son los mismos números que pidiéndolos de a uno) y se consumen en orden
+    go_around = (rng.random(t1 - t0 + 1) < 0.1).tolist() if windy else []
+    n_sorteos = 0
 
     timeline_landings: List[float] = []
     last_landing_time = -1e9
 
-    # simulación minuto a minuto
-    for t in range(t0, t1+1):
-        # pista abierta?
-        open_runway = True
-        if closure_minute is not None and closure_minute <= t < closure_minute + closure_duration:
-            open_runway = False
-
-        # ordenar por proximidad para aplicar reglas de separación
-        approaching = [f for f in flights if f.status in ("approach", "backtrack")]
-        approaching.sort(key=lambda f: f.distancia_a_aep)
-
-        # velocidad por defecto = vmax por banda (o backtrack fijo)
-        leader_speed = None
-        for f in approaching:
-            if f.status == "backtrack":
-                f.velocidad = velocidad_reversa
-                continue
-
-            vmin, vmax = f.velocidad_permitida()
-            desired = vmax  # sin congestión
-            # separación con el de adelante (si existe)
-            if leader_speed is not None:
-                # estimar gap temporal tosco: diferencia de distancias divididas por speeds (heurística)
-                # (aprox rápido para decidir si hay riesgo; lo refinado implicaría predecir ETAs por integración)
-                lead = leader  # definido en loop anterior
-                # tiempo restante estimado (min) = d / (v_nm/min)
-                t_self = f.distancia_a_aep / (desired/60.0)
-                t_lead = lead.distancia_a_aep / (lead.velocidad/60.0)
-                gap = (t_self - t_lead)
-
-                if gap < separacion_minima:
-                    # regla: el follower baja 20 kts vs el líder hasta lograr >=5 min
-                    candidate = min(desired, max(vmin, lead.velocidad - 20.0))
-                    if candidate < vmin:
-                        # congestión fuerte: entra en backtrack
-                        f.status = "backtrack"
-                        f.velocidad = velocidad_reversa
-                        f.sufrio_congestion = True
-                    else:
-                        f.velocidad = candidate
-                        f.sufrio_congestion = True
-                        # reeval gap tosco; si sigue corto, lo dejamos para el próximo minuto
-                else:
-                    f.velocidad = desired
-            else:
-                f.velocidad = desired
-
-            leader_speed = f.velocidad
-            leader = f  # para el próximo
+    # pista abierta? (se decide una vez para todo el día, no con un if por minuto)
+    cerrada = range(closure_minute, closure_minute + closure_duration) if closure_minute is not None else range(0)
+    pista_abierta = [t not in cerrada for t in range(t0, t1+1)]
 
-        # avanzar todos
-        for f in flights:
-            prev_d = f.distancia_a_aep
-            f.step(dt_min=1.0, open_runway=open_runway)
-
-        # registrar aterrizajes con regla de separación real en la pista
-        for f in flights:
-            if f.status == "landed" and f.instante_aterrizaje is None:
-                # aplica la separación en la pista (si está muy cerca del anterior, el aterrizaje se difiere)
-                landing_time = float(t)
-                if timeline_landings and landing_time - timeline_landings[-1] < separacion_minima:
-                    # no puede aterrizar aún; forzamos un pequeño "hold" de 1 min
-                    # (en un modelo más fino esto sería un go-around; aquí lo tratamos como espera corta)
-                    f.status = "approach"
-                    f.distancia_a_aep = max(0.5, f.distancia_a_aep)  # lo devolvemos levemente arriba
-                else:
-                    # OK, aterriza
-                    f.instante_aterrizaje = landing_time
-                    timeline_landings.append(landing_time)
-                    last_landing_time = landing_time
-                    # ¿go-around estocástico (viento)?
-                    if windy and random.random() < 0.1:
-                        # vuelve a 6 nm y lo marcamos como 'goaround' temporalmente
-                        f.status = "goaround"
-                        f.distancia_a_aep = 6.0
-                        f.velocidad = 180.0
-                        f.instante_aterrizaje = None  # todavía no había aterrizado
-                    else:
-                        f.status = "landed"
+    # simulación minuto a minuto
+    for t, open_runway in zip(range(t0, t1+1), pista_abierta):
+
+        # ordenar por proximidad para aplicar reglas de separación (orden estable: empates por id)
+        approaching = fleet.activos
+        approaching = approaching[np.argsort(fleet.dist[approaching], kind="stable")]
+
+        # velocidad por defecto = vmax por banda (o backtrack fijo); la regla de separación va contra la velocidad
+        # ya decidida del de adelante (el anterior en la cola que no está en backtrack)
+        back = fleet.status[approaching] == BACKTRACK
+        fleet.vel[approaching[back]] = velocidad_reversa
+        cola = approaching[~back]
+        if len(cola):
+            vels, cerca, a_backtrack = velocidades_en_cola(fleet.dist[cola])
+            fleet.vel[cola] = vels
+            fleet.congested[cola[1:][cerca]] = True
+            fleet.status[cola[1:][a_backtrack]] = BACKTRACK
+
+        # avanzar todos (aparte del recorrido de arriba: es una sola operación de numpy, y si se moviera a cada uno
+        # dentro del recorrido el siguiente vería la distancia ya movida de su líder; los aterrizajes se registran
+        # después en orden de id, que no es el orden por distancia)
+        fleet.step(dt_min=1.0, open_runway=open_runway)
+
+        # registrar aterrizajes con regla de separación real en la pista (en orden de id)
+        # en un mismo minuto aterriza a lo sumo uno: el primero por id si pasaron >= separacion_minima desde el anterior
+        # (last_landing_time arranca en -1e9: el primero siempre aterriza); los demás quedan 0 min detrás de él
+        act = fleet.activos
+        nuevos = act[(fleet.status[act] == LANDED) & np.isnan(fleet.instante_aterrizaje[act])]
+        if len(nuevos):
+            landing_time = float(t)
+            espera = nuevos
+            if not landing_time - last_landing_time < separacion_minima:
+                # OK, aterriza el primero
+                i, espera = nuevos[0], nuevos[1:]
+                fleet.instante_aterrizaje[i] = landing_time
+                timeline_landings.append(landing_time)
+                last_landing_time = landing_time
+                # ¿go-around estocástico (viento)?
+                if windy and go_around[n_sorteos]:
+                    # vuelve a 6 nm y lo marcamos como 'goaround' temporalmente
+                    fleet.status[i] = GOAROUND
+                    fleet.dist[i] = 6.0
+                    fleet.vel[i] = 180.0
+                    fleet.instante_aterrizaje[i] = np.nan  # todavía no había aterrizado
+                n_sorteos += 1
+            # los que no pueden aterrizar aún: forzamos un pequeño "hold" de 1 min
+            # (en un modelo más fino esto sería un go-around; aquí lo tratamos como espera corta)
+            fleet.status[espera] = APPROACH
+            fleet.dist[espera] = np.maximum(0.5, fleet.dist[espera])  # lo devolvemos levemente arriba
 
         # procesar goarounds: se vuelven "approach" al minuto siguiente
-        for f in flights:
-            if f.status == "goaround":
-                f.status = "approach"
+        fleet.status[act[fleet.status[act] == GOAROUND]] = APPROACH
+        fleet.actualizar_activos()
 
         # si está backtracking y pasó 100 nm => desvío
         # (la lógica avanzada de reingreso en gap ≥10 min queda como TODO)
         # TODO: Implementar reingreso cuando exista gap ≥10 min en `timeline_landings` futuro.
 
-    # métricas
-    landed = [f for f in flights if f.instante_aterrizaje is not None]
-    diverted = [f for f in flights if f.status == "diverted"]
-    congested = [f for f in flights if f.sufrio_congestion]
-
-    delays = []
-    for f in landed:
-        if f.eta_base is not None:
-            delays.append(max(0.0, f.instante_aterrizaje - f.eta_base))
+    # métricas (directo de los arrays de la flota; la lista de Avion se arma sólo para SimResult.flights)
+    landed = ~np.isnan(fleet.instante_aterrizaje)
+    n_landed = int(np.count_nonzero(landed))
+    delays = np.maximum(0.0, fleet.instante_aterrizaje[landed] - fleet.eta_base[landed])
+    # suma en orden de id con accumulate (secuencial, como sum()); .sum()/.mean() suman por pares y pueden diferir en el último bit
+    suma = np.add.accumulate(delays)[-1].item() if n_landed else 0.0
 
     metrics = {
-        "spawned": len(flights),
-        "landed": len(landed),
-        "diverted": len(diverted),
-        "congestion_rate_per_flight": (len(congested) / max(1, len(flights))),
-        "avg_delay_min": (sum(delays)/len(delays)) if delays else 0.0,
+        "spawned": fleet.n,
+        "landed": n_landed,
+        "diverted": int(np.count_nonzero(fleet.status == DIVERTED)),
+        "congestion_rate_per_flight": (int(np.count_nonzero(fleet.congested)) / max(1, fleet.n)),
+        "avg_delay_min": (suma/n_landed) if n_landed else 0.0,
     }
-    return SimResult(flights=flights, metrics=metrics, timeline_landings=timeline_landings)
+    return SimResult(flights=fleet.to_aviones(), metrics=metrics, timeline_landings=timeline_landings, flota=fleet)
 
 
+def simulate_ensemble(
+    lam: float,
+    seeds: List[int],
+    day_minutes: int = (cierre_aep_min - apertura_aep_min),
+    windy: bool = False,
+    closure_minute: Optional[int] = None,
+    closure_duration: int = 30,
+) -> Dict[str, np.ndarray]:
+    """
+    Corre K = len(seeds) días de simulate_day a la vez: el estado es (K, cap) y cada paso del minuto es una operación
+    de numpy sobre todos los días (también la regla de separación, con el punto fijo de velocidades_en_cola), así
+    que el costo de Python no crece con K.
+    Devuelve las métricas de simulate_day como arrays de largo K; la fila k da lo mismo que
+    simulate_day(lam, seed=seeds[k]) (cada día sortea el viento con su propio Generator, como allá).
+    """
+    K = len(seeds)
+    t0, t1 = 0, day_minutes
+    rngs = [np.random.default_rng(sd) for sd in seeds]
+    llegadas = [bernoulli_arrivals(lam, t0, t1, rng) for rng in rngs]
+    # viento: los sorteos de cada día sacados de una vez de su Generator (como en simulate_day), uno por aterrizaje
+    go_around = np.array([rng.random(t1 - t0 + 1) < 0.1 for rng in rngs]) if windy else None
+    n_sorteos = np.zeros(K, dtype=np.intp)
+    n = np.array([len(sp) for sp in llegadas])
+    cap = int(n.max(initial=0))
+    existe = np.arange(cap) < n[:, None]  # (K, cap): los lugares sin avión quedan LANDED sin aterrizaje (no cuentan)
+
+    spawn = np.zeros((K, cap))
+    for k, sp in enumerate(llegadas):
+        spawn[k, :len(sp)] = sp
+    dist = np.full((K, cap), 100.0)
+    vel = np.full((K, cap), 300.0)
+    status = np.where(existe, APPROACH, LANDED).astype(np.int8)
+    eta_base = spawn + FREE_FLOW_ETA
+    congested = np.zeros((K, cap), dtype=bool)
+    instante = np.full((K, cap), np.nan)
+    ultimo_aterrizaje = np.full(K, -np.inf)  # -inf = todavía no aterrizó nadie ese día
+    filas = np.arange(K)
+
+    cerrada = range(closure_minute, closure_minute + closure_duration) if closure_minute is not None else range(0)
+    for t, open_runway in zip(range(t0, t1+1), [t not in cerrada for t in range(t0, t1+1)]):
+
+        # orden por distancia de los approach/backtrack de cada día (los demás al final, con distancia inf)
+        act = status <= BACKTRACK
+        m = act.sum(axis=1)
+        M = int(m.max(initial=0))
+        if M:
+            # sólo se ordena la ventana de columnas donde queda algún activo (los ids viejos ya aterrizaron en todos los días)
+            cols = np.flatnonzero(act.any(axis=0))
+            lo, hi = cols[0], cols[-1] + 1
+            orden = lo + np.argsort(np.where(act[:, lo:hi], dist[:, lo:hi], np.inf), axis=1, kind="stable")[:, :M]
+            D = np.take_along_axis(dist, orden, axis=1)
+            V = np.take_along_axis(vel, orden, axis=1)
+            ST = np.take_along_axis(status, orden, axis=1)
+            CG = np.take_along_axis(congested, orden, axis=1)
+            VMIN, VMAX = velocidades_por_distancia(D)
+            VMAX_NM = VMAX / 60.0
+            valido = np.arange(M) < m[:, None]
+
+            # líder de cada uno = el anterior en su fila que no venía en backtrack (-1 si no hay); después, el mismo punto
+            # fijo que velocidades_en_cola pero sobre toda la matriz (K, M) a la vez
+            back = valido & (ST == BACKTRACK)
+            normal = valido & ~back
+            ultimo = np.maximum.accumulate(np.where(normal, np.arange(M), -1), axis=1)
+            lider = np.full((K, M), -1)
+            lider[:, 1:] = ultimo[:, :-1]
+            con_lider = normal & (lider >= 0)
+            lider = np.maximum(lider, 0)
+            lead_d = np.take_along_axis(D, lider, axis=1)
+            t_self = D / VMAX_NM
+            V = np.where(normal, VMAX, np.where(back, velocidad_reversa, V))
+            gap = np.full((K, M), np.inf)
+            while True:
+                lead_v = np.take_along_axis(V, lider, axis=1)
+                np.subtract(t_self, lead_d / (lead_v / 60.0), out=gap, where=con_lider)
+                cerca = con_lider & (gap < separacion_minima)
+                candidate = np.minimum(VMAX, np.maximum(VMIN, lead_v - 20.0))
+                a_backtrack = cerca & (candidate < VMIN)
+                nuevas = np.where(cerca, np.where(a_backtrack, velocidad_reversa, candidate), VMAX)
+                nuevas = np.where(normal, nuevas, V)
+                if np.array_equal(nuevas, V):
+                    break
+                V = nuevas
+            ST[a_backtrack] = BACKTRACK
+            CG |= cerca
+            np.put_along_axis(vel, orden, V, axis=1)
+            np.put_along_axis(status, orden, ST, axis=1)
+            np.put_along_axis(congested, orden, CG, axis=1)
+
+        # avanzar todos
+        app = status == APPROACH
+        back = status == BACKTRACK
+        dist[app] = np.maximum(0.0, dist[app] - vel[app] / 60.0)
+        if open_runway:
+            status[app & (dist == 0.0)] = LANDED
+        dist[back] += reversa_nm_por_min
+        status[back & (dist > 100.0)] = DIVERTED
+
+        # aterrizajes: en cada día sólo el primero (por id) de los que llegaron puede aterrizar en este minuto
+        nuevos = (status == LANDED) & np.isnan(instante) & existe
+        if nuevos.any():
+            hay = nuevos.any(axis=1)
+            primero = np.argmax(nuevos, axis=1)
+            aterriza = hay & ~(t - ultimo_aterrizaje < separacion_minima)
+            k_at, i_at = filas[aterriza], primero[aterriza]
+            espera = nuevos.copy()
+            espera[k_at, i_at] = False
+            status[espera] = APPROACH  # hold de 1 min: lo devolvemos levemente arriba
+            dist[espera] = np.maximum(0.5, dist[espera])
+            instante[k_at, i_at] = float(t)
+            ultimo_aterrizaje[aterriza] = float(t)
+            if windy:
+                go = go_around[k_at, n_sorteos[k_at]]
+                n_sorteos[k_at] += 1
+                k_go, i_go = k_at[go], i_at[go]
+                status[k_go, i_go] = APPROACH  # go-around: vuelve a approach al minuto siguiente
+                dist[k_go, i_go] = 6.0
+                vel[k_go, i_go] = 180.0
+                instante[k_go, i_go] = np.nan
+
+    # métricas (mismas cuentas que simulate_day, por fila)
+    aterrizo = ~np.isnan(instante)
+    n_landed = np.count_nonzero(aterrizo, axis=1)
+    delays = np.where(aterrizo, np.maximum(0.0, instante - eta_base), 0.0)
+    suma = np.add.accumulate(delays, axis=1)[:, -1] if cap else np.zeros(K)  # suma en orden de id, como sum()
+    return {
+        "spawned": n,
+        "landed": n_landed,
+        "diverted": np.count_nonzero((status == DIVERTED) & existe, axis=1),
+        "congestion_rate_per_flight": np.count_nonzero(congested & existe, axis=1) / np.maximum(1, n),
+        "avg_delay_min": np.where(n_landed > 0, suma / np.maximum(1, n_landed), 0.0),
+    }
+
+
+
+def simulate_many(lams: List[float], seeds: List[int], n_workers: int = 1, **kwargs) -> Dict[str, np.ndarray]:
+    """
+    Barrido de Monte Carlo: simulate_ensemble(lam, seeds, **kwargs) para cada lam de lams. Devuelve las métricas como
+    arrays (len(lams), len(seeds)). Con n_workers > 1 reparte bloques de seeds de cada lam entre procesos; los días son
+    independientes entre sí, así que sale lo mismo que con un solo proceso.
+    """
+    seeds = list(seeds)
+    cortes = np.linspace(0, len(seeds), max(1, min(n_workers, len(seeds))) + 1).astype(int)  # bordes de los bloques
+    tareas = [(lam, seeds[c0:c1]) for lam in lams for c0, c1 in zip(cortes[:-1], cortes[1:])]
+    correr = partial(simulate_ensemble, **kwargs)
+    if n_workers <= 1:
+        partes = [correr(lam, bloque) for lam, bloque in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as ex:
+            partes = list(ex.map(correr, *zip(*tareas)))
+    return {k: np.concatenate([p[k] for p in partes]).reshape(len(lams), len(seeds)) for k in partes[0]}
+
 # TP1 – Ejercicio 1: simulación Monte Carlo básica + visualización
 
 def _estado_visual(status: str, congested: bool) -> str:
@@ -256,6 +509,7 @@ def _estado_visual(status: str, congested: bool) -> str:
     return "black"
 
 def _legend_handles():
+    from matplotlib.lines import Line2D
     return [
         Line2D([0],[0], marker='o', linestyle='None', label='approaching', color='tab:blue'),
         Line2D([0],[0], marker='o', linestyle='None', label='delayed',     color='tab:orange'),
@@ -269,18 +523,24 @@ def save_gif_visualizacion(sim: SimResult, out_path: str = "aep_sim.gif", fps: i
       - X: distancia a AEP (nm), 100 → 0
       - Y: pista (canal) por avión para separar puntos
       - Color por estado visual (approaching/delayed/backtrack/diverted)
-    Usa Line2D para los puntos y la leyenda.
+    Usa un solo scatter (PathCollection) para todos los puntos y Line2D para la leyenda.
+    Los frames se dibujan a mano y se arman con Pillow (sin FuncAnimation/PillowWriter).
     """
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import to_rgba_array
+
     flights = sim.flights
     if not flights:
         print("No hay vuelos para visualizar.")
         return
+    flota = sim.flota
+    if flota is None or flota.n_hist == 0:
+        print("No hay historial para visualizar: corré simulate_day con record_history=True.")
+        return
+    n_h = flota.n_hist  # filas de historial
 
     # Duración de la animación = máximo tiempo logueado en historial
-    t_max = 0
-    for f in flights:
-        if f.historial:
-            t_max = max(t_max, int(f.historial[-1][0]))
+    t_max = max(int(f.momento_aparicion) for f in flights) + n_h - 1
 
     # Pre-asignamos una "pista" Y por avión para evitar superposición
     # (simple: fila entera; si son muchos, compactar con modulo)
@@ -293,68 +553,53 @@ def save_gif_visualizacion(sim: SimResult, out_path: str = "aep_sim.gif", fps: i
     ax.invert_xaxis()         # que "avance" hacia la izquierda (100→0)
     ax.set_xlabel("Distancia a AEP (mn)")
     ax.set_ylabel("Pista por avión (solo visual)")
-    ax.set_title("Aproximaciones a AEP – estados por color")
+    titulo = ax.set_title("Aproximaciones a AEP – estados por color")  # el Text se reusa: en cada frame sólo cambia el texto
 
-    # Creamos un Line2D por avión (marker-only)
-    line_by_id: Dict[int, Line2D] = {}
-    for f in flights:
-        ln = Line2D([], [], linestyle='None', marker='o', markersize=6)
-        ax.add_line(ln)
-        line_by_id[f.id] = ln
+    # Un solo scatter para todos los aviones: por frame se le cambian posiciones y colores de una vez
+    # (antes: un Line2D por avión, N artistas para actualizar y dibujar en cada frame)
+    puntos = ax.scatter([], [], s=6**2, linewidths=1.0)  # mismo tamaño que el marker 'o' de markersize 6
 
     # Leyenda con Line2D
     ax.legend(handles=_legend_handles(), loc="upper right")
 
-    def sample_record_at_time(f: Avion, t: int) -> Optional[Tuple[float, float, float, str, bool]]:
-        """Devuelve el último registro de historial con tiempo <= t, o None si aún no apareció."""
-        # Los tiempos se agregan por minuto en orden; podemos indexar por (t - momento_aparicion) si es válido
-        idx = t - int(f.momento_aparicion)
-        if idx < 0:
-            return None
-        if idx >= len(f.historial):
-            # ya no hay más registros (p.ej. luego de que terminó el día)
-            return f.historial[-1] if f.historial else None
-        return f.historial[idx]
+    # Muestreo vectorizado del historial: para el frame t, el avión i está en la fila t - spawn_i (la última si ya no hay
+    # más registros, p.ej. luego de que terminó el día; invisible si todavía no apareció)
+    spawn = np.array([int(f.momento_aparicion) for f in flights])
+    filas = np.array([f.id - 1 for f in flights])
+    y_lane = np.array([lanes[f.id] for f in flights]) * lane_scale
+    # color de cada (código de estado, congestionado), con la misma regla que _estado_visual
+    tabla_color = to_rgba_array([_estado_visual(nombre, cong) for nombre in STATUS_NAMES for cong in (False, True)])
+    tabla_color = tabla_color.reshape(len(STATUS_NAMES), 2, 4)
 
     def update(frame_t: int):
-        # Actualizamos la posición y color de cada avión en este minuto
-        for f in flights:
-            rec = sample_record_at_time(f, frame_t)
-            ln = line_by_id[f.id]
-            if rec is None:
-                # antes de aparecer: oculto
-                ln.set_data([], [])
-                continue
-
-            t_rec, d_nm, v_kts, status, congested = rec
-
-            # No mostramos si ya está landed (punto desaparece)
-            if status == "landed":
-                ln.set_data([], [])
-                continue
-            if status == "diverted" and d_nm > 100.0:
-                # ya se fue (opcional: si querés mostrarlo clavado en >100, quitá este if)
-                ln.set_data([], [])
-                continue
-
-            y = lanes[f.id] * lane_scale
-            ln.set_data([d_nm], [y])
-            ln.set_color(_estado_visual(status, congested))
-
-        ax.set_title(f"Aproximaciones a AEP – t = {frame_t} min")
-        return tuple(line_by_id.values())
-
-    anim = animation.FuncAnimation(
-        fig, update,
-        frames=range(0, t_max + 1, max(1, int(60/fps))),  # muestreamos acorde al fps
-        interval=1000/fps,
-        blit=True
-    )
+        idx = frame_t - spawn
+        aparecio = idx >= 0  # antes de aparecer: oculto
+        k = np.minimum(idx[aparecio], n_h - 1)
+        i = filas[aparecio]
+        d_nm = flota.hist_dist[k, i]
+        status = flota.hist_status[k, i]
+        congested = flota.hist_congested[k, i]
+        # No mostramos los landed (el punto desaparece) ni los diverted que ya se fueron
+        visible = (status != LANDED) & ~((status == DIVERTED) & (d_nm > 100.0))
+
+        puntos.set_offsets(np.column_stack((d_nm[visible], y_lane[aparecio][visible])))
+        colores = tabla_color[status[visible], congested[visible].astype(np.intp)]
+        puntos.set_facecolors(colores)
+        puntos.set_edgecolors(colores)
+        titulo.set_text(f"Aproximaciones a AEP – t = {frame_t} min")
 
     try:
         # Requiere Pillow instalado: pip install pillow
-        writer = animation.PillowWriter(fps=fps)
-        anim.save(out_path, writer=writer)
+        from PIL import Image
+
+        # Un solo draw por frame y leemos el buffer RGBA del canvas directo (anim.save dibujaba dos veces cada
+        # frame: draw_idle + savefig, y además pasaba por un BytesIO)
+        imgs = []
+        for frame_t in range(0, t_max + 1, max(1, int(60/fps))):  # muestreamos acorde al fps
+            update(frame_t)
+            fig.canvas.draw()
+            imgs.append(Image.fromarray(np.asarray(fig.canvas.buffer_rgba())).convert("RGB"))
+        imgs[0].save(out_path, save_all=True, append_images=imgs[1:], duration=int(1000 / fps), loop=0)
         print(f"GIF guardado en: {out_path}")
     except Exception as e:
         print("No pude escribir el GIF. ¿Tenés 'pillow' instalado?:", e)
@@ -377,7 +622,8 @@ if __name__ == "__main__":
         seed=seed,
         windy=windy,
         closure_minute=cierre,
-        closure_duration=duracion_cierre
+        closure_duration=duracion_cierre,
+        record_history=True,      # el GIF se arma con el historial
     )
 
     # Mostrar métricas
@@ -3,11 +3,17 @@ import matplotlib
 import numpy as np
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
-import math, random
+from enum import IntEnum
+import math
+from bisect import bisect_left, bisect_right, insort
 import matplotlib.pyplot as plt
 matplotlib.use("Agg")
 from matplotlib.lines import Line2D
-import matplotlib.animation as animation
+from matplotlib.colors import to_rgba_array
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+import os
 
 #! Conversion de Unidades
 def nm_to_km(nm: float) -> float: return nm * 1.852
@@ -34,38 +40,61 @@ velocidades = [
 ]
 
 #! Funciones Utiles a lo largo del problema
+#*Las mismas bandas ordenadas por el borde de abajo (0, 5, 15, 50, 100) para buscar con bisect en vez de recorrerlas
+_BANDAS_ASC = sorted(velocidades)
+_BANDA_LO = [lo for lo, _, _, _ in _BANDAS_ASC]
+_BANDA_VEL = [(vmin, vmax) for _, _, vmin, vmax in _BANDAS_ASC]
+
 def velocidad_por_distancia(d_nm: float) -> Tuple[float, float]:
-    for lo, hi, vmin, vmax in velocidades:
-        if lo <= d_nm < hi:
-            return vmin, vmax
-    # si está más allá de 100 nm:
-    return velocidades[0][2], velocidades[0][3]
+    i = bisect_right(_BANDA_LO, d_nm) - 1
+    if i < 0:
+        # por debajo de 0 nm no hay banda (igual que antes, cae en la de >100 nm):
+        return velocidades[0][2], velocidades[0][3]
+    return _BANDA_VEL[i]
 
 def eta_min(dist_nm: float, speed_kts: float) -> float:
     """Tiempo a pista (min) asumiendo velocidad constante."""
-    return float('inf') if speed_kts <= 0 else dist_nm / (speed_kts / 60.0)
+    return math.inf if speed_kts <= 0 else dist_nm / (speed_kts / 60.0)
 
 def gap_minutos(self_dist: float, self_speed: float, lead_dist: float, lead_speed: float) -> float:
     """ETA(seguidor) - ETA(líder) en minutos, con velocidades actuales."""
-    return eta_min(self_dist, self_speed) - eta_min(lead_dist, lead_speed)
+    #*Las dos ETAs en linea y sin el chequeo de velocidad <= 0: en step siempre llega vmax de la banda para el seguidor
+    #*y un lider en approach/delayed, que vuela a >= vmin > 0, asi que el inf de eta_min nunca se usaba aca
+    return self_dist / (self_speed / 60.0) - lead_dist / (lead_speed / 60.0)
 
-def encontrar_lider(self: "Avion", cohort: Dict[int, "Avion"]):
+def encontrar_lider(self: "Avion", cohort: Dict[int, "Avion"], orden: List[Tuple[float, int]]):
     #*Devuelve el avion por delante mas cercano que no este en diverted, landed o turnaround *#
-    candidatos = [a for a in cohort.values() if a.id != self.id and a.distancia_a_aep < self.distancia_a_aep and a.status in("approach", "delayed")]
-    if not candidatos:
+    #*orden tiene (distancia, id) de los aviones en approach/delayed ordenado por distancia: el lider es el anterior a mi
+    #*en la lista (busqueda binaria, O(log N)) en vez de recorrer todo el cohort. Con empate de distancia queda el de id
+    #*mas grande, que es el primero que aparecia recorriendo el cohort
+    k = bisect_left(orden, (self.distancia_a_aep, -math.inf))
+    if k == 0:
         return None
-    
-    return max(candidatos, key=lambda a: a.distancia_a_aep)
 
+    return cohort[orden[k - 1][1]]
+
+
+#! Estados del avion como enteros: comparar es una sola operacion en vez de comparar strings
+#! El orden importa: approach/delayed (los que pueden ser lider) <= DELAYED y diverted/landed (terminados) >= DIVERTED,
+#! asi cada chequeo de "esta en alguno de estos estados" es una sola comparacion de enteros
+class Estado(IntEnum):
+    APPROACH = 0
+    DELAYED = 1
+    TURNAROUND = 2
+    DIVERTED = 3
+    LANDED = 4
+
+#*Alias a nivel modulo: Estado.X busca el atributo en la clase del enum cada vez (~100 ns), el global es mucho mas rapido
+APPROACH, DELAYED, TURNAROUND, DIVERTED, LANDED = Estado.APPROACH, Estado.DELAYED, Estado.TURNAROUND, Estado.DIVERTED, Estado.LANDED
 
 #! Clase Avion y sus metodos 
-@dataclass
+@dataclass(slots=True)
 class Avion:
     id: int
     momento_aparicion: float  # minuto en que aparece a 100 nm
     distancia_a_aep: float = 100.0
     velocidad: float = 300.0
-    status: str = "approach"  # approach | delayed | turnaround | diverted | landed
+    status: Estado = APPROACH  # APPROACH | DELAYED | TURNAROUND | DIVERTED | LANDED
 
 
     def velocidad_permitida(self) -> Tuple[float, float]:
@@ -73,6 +102,7 @@ class Avion:
     
  
     def step(self, *, cohort: Dict[int, "Avion"],
+                     orden: List[Tuple[float, int]],
                      dt_min: float = 1.0,
                      gap_target_min: float = separacion_target,
                      gap_minimo_min: float = separacion_minima,
@@ -86,29 +116,29 @@ class Avion:
         
 
         #*Set del avion en el minuto i, donde si aterrizo o se fue a Montevideo no me importa mas y sino chequeo si tiene algun avion por delante para evaluar potenciales cambios en su andar
-        if self.status in ("landed", "diverted"):
+        if self.status >= DIVERTED:  #*landed o diverted
             return
         
-        leader = encontrar_lider(self, cohort)
+        leader = encontrar_lider(self, cohort, orden)
 
         vmin, vmax = velocidad_por_distancia(self.distancia_a_aep)
 
         #*En el caso que el avion esta en turnaround 
-        if self.status == "turnaround":
+        if self.status == TURNAROUND:
             if leader is None:
-                self.status = "approach"
+                self.status = APPROACH
                 self.velocidad = vmax
 
             else:
                 gap = gap_minutos(self.distancia_a_aep, vmax, leader.distancia_a_aep, leader.velocidad)
                 if gap >= gap_reingreso_min:
-                    self.status = "approach"
+                    self.status = APPROACH
                     self.velocidad = vmax
                 else:
                     self.velocidad = velocidad_reversa
                     self.distancia_a_aep += knots_to_nm_per_min(self.velocidad) * dt_min
                     if self.distancia_a_aep >= 100.0:
-                        self.status = "diverted"
+                        self.status = DIVERTED
                     return
                 
 
@@ -117,37 +147,33 @@ class Avion:
             velDes = vmax
             if leader is None:
                 self.velocidad = velDes
-                self.status = "approach"
+                self.status = APPROACH
             else:
                 #* Quiero calcular el gap si yo voy a la velocidad maxima que me permiten y el de adelante a la velocidad que vaya
                 gap = gap_minutos(self.distancia_a_aep, velDes, leader.distancia_a_aep, leader.velocidad)
                 if gap < gap_minimo_min: #!Estoy a menos de 4min
                     nuevaVel = min(velDes, leader.velocidad - 20.0)
                     if nuevaVel < vmin: #!me fui por debajo de los limites
-                        self.status = "turnaround"
+                        self.status = TURNAROUND
                         self.velocidad = velocidad_reversa
 
                         self.distancia_a_aep += knots_to_nm_per_min(self.velocidad) * dt_min #!Hago de cuenta como que avance un minuto para ver si me fui de las 100 mn
                         if self.distancia_a_aep > 100.0:
-                            self.status = "diverted"
+                            self.status = DIVERTED
                         return
                     else:
                         self.velocidad = nuevaVel
-                        self.status = "delayed"
+                        self.status = DELAYED
 
-                elif gap >= gap_target_min: #!Consegui un gap de 5min o mas
-                    self.status = "approach"
-                    self.velocidad = velDes
-                
-                else: #!Estoy entre 4 y 5 minutos -> sigo todavia puedo ir a la velocidad que quiera
+                else: #!Gap de 4min o mas -> voy a la velocidad que quiera; approach si ya llegue a 5min, delayed si estoy entre 4 y 5
                     self.velocidad = velDes
-                    self.status = "delayed"
+                    self.status = APPROACH if gap >= gap_target_min else DELAYED
         
         avance_mn = knots_to_nm_per_min(self.velocidad) *dt_min
         self.distancia_a_aep = max(0.0, self.distancia_a_aep - avance_mn)
 
-        if self.status != "turnaround" and self.distancia_a_aep <= 0.0:
-            self.status = "landed"
+        if self.status != TURNAROUND and self.distancia_a_aep <= 0.0:
+            self.status = LANDED
             self.velocidad = 0.0
             return
 
@@ -156,39 +182,62 @@ class Avion:
 #!Defino la funcion que representa las llegadas Bernoulli por minuto
 def tiempos_de_spawn(lam_per_min, t0, t1, seed=42):
     
-    rng = random.Random(seed)
-    tiempos = []
-    for i in range (t0, t1):
-        u = rng.random()
-        if u < lam_per_min:
-            tiempos.append(i)
-    return tiempos
+    #*Un sorteo uniforme por minuto, todos de una con numpy en vez de un rng.random() por vuelta.
+    #*En float32 alcanza (solo se compara contra lambda) y sale la mitad de bits del generador
+    rng = np.random.default_rng(seed)
+    hay_arribo = rng.random(t1 - t0, dtype=np.float32) < lam_per_min
+    return (np.flatnonzero(hay_arribo) + t0).tolist()
 
 #!Defino otra funcion que define los estados y sus colores asociados que se van a usar posteriormente en la visualizacion
+COLORES_ESTADO = ("tab:blue", "tab:orange", "tab:red", "tab:green", "tab:gray")  #*indexado por Estado
+PALETA_RGBA = to_rgba_array(COLORES_ESTADO)  #*lo mismo en RGBA, para armar los colores de un frame con un solo take
+
 def color_estados(estado):
-    return {
-        "approach": "tab:blue",
-        "delayed":    "tab:orange",
-        "turnaround": "tab:red",
-        "diverted":   "tab:green",
-        "landed": "tab:gray"
-    }.get(estado, "diverted")
+    return COLORES_ESTADO[estado]
 
 
 
 #!Ahora la simulacion 
 
-def simular(lam, t_inicio, t_final, seed = 42):
+#*Recorrido de un avion que vuela solo desde que aparece: _RECORRIDO_LIBRE[a-1] = (distancia, velocidad) despues de a minutos.
+#*Se arma una vez dando steps a un avion sin nadie mas (termina en el ultimo minuto antes de aterrizar)
+def _recorrido_libre():
+    av = Avion(0, 0.0)
+    recorrido = []
+    while True:
+        av.step(cohort={}, orden=[])
+        if av.status == LANDED:
+            return tuple(recorrido)
+        recorrido.append((av.distancia_a_aep, av.velocidad))
+
+_RECORRIDO_LIBRE = _recorrido_libre()
+
+def simular(lam, t_inicio, t_final, seed = 42, warmup = "simulado"):
     
-    rng = random.Random(seed)
+    #*warmup (solo importa si t_inicio < 0): "simulado" corre la simulacion desde t_inicio como siempre; "analitico" arranca
+    #*directo en t = 0 con los aviones que habrian aparecido en los ultimos minutos (mismos sorteos Bernoulli por minuto),
+    #*cada uno donde estaria si hubiera volado solo. Se descartan los que al aparecer quedaban a menos de 4 min del anterior
+    #*(esos se van a turnaround en 100 nm y quedan diverted enseguida). Es una aproximacion: anda bien con lambda chico
+    #*pero con lambda alto subestima la cola (no hay delayed ni turnaround al arrancar)
+    tiempos_iniciales = []
+    if warmup == "analitico" and t_inicio < 0:
+        vmax_100 = velocidad_por_distancia(100.0)[1]
+        for t in tiempos_de_spawn(lam, -len(_RECORRIDO_LIBRE), 0, np.random.SeedSequence(seed).spawn(1)[0]):
+            if tiempos_iniciales and t - tiempos_iniciales[-1] - 1 < len(_RECORRIDO_LIBRE):
+                d_lider, v_lider = _RECORRIDO_LIBRE[t - tiempos_iniciales[-1] - 1]
+                if gap_minutos(100.0, vmax_100, d_lider, v_lider) < separacion_minima:
+                    continue
+            tiempos_iniciales.append(t)
+        t_inicio = 0
 
     #*Importante: Para que la simulacion sea consistente con la funcion step que defini antes es importante que los id's de aviones 
     #*vayan en orden decreciente asi el avion con mayor id es el que mas cerca de AEP se encuentre
 
     prox_avion_id = 0
 
-    vuelos: List[Avion] = []
+    en_vuelo: List[Avion] = []  #*Solo los que todavia no aterrizaron ni se desviaron (los unicos a los que step les hace algo), del mas nuevo al mas viejo
     cohort: Dict[int, Avion] = {}  #*Cohort es un metodo que sirve para poder trackear el avion con solamente el id y no tener que recorrer toda la lista (complejidad O(N))
+    orden: List[Tuple[float, int]] = []  #*(distancia, id) de los que estan en approach/delayed, ordenado por distancia (para encontrar_lider)
 
     spawns = set(tiempos_de_spawn(lam, t_inicio, t_final, seed))
 
@@ -197,49 +246,82 @@ def simular(lam, t_inicio, t_final, seed = 42):
     lane_counter = 0
     lane_step = 1.2
 
-    frames = []
+    #*Los frames van en arrays preallocados (uno por minuto capturado, a lo sumo un lugar por avion que aparecio)
+    #*en vez de 3 listas nuevas por minuto: fila i = minuto i, y cuantos[i] dice cuantos lugares de la fila se usan
+    n_frames = max(0, t_final - max(t_inicio, 0))
+    n_max = max(1, len(spawns) + len(tiempos_iniciales))
+    xs_frames = np.zeros((n_frames, n_max), dtype=np.float64)
+    ys_frames = np.empty((n_frames, n_max), dtype=np.float64)
+    estados_frames = np.empty((n_frames, n_max), dtype=np.int8)
+    cuantos = np.zeros(n_frames, dtype=np.int32)
+    fila = 0
+    ys_en_vuelo: List[float] = []  #*altura de cada avion de en_vuelo (en orden de aparicion); solo cambia cuando aparece o termina alguno
+
+    def aparecer(t, dist, vel):
+        nonlocal prox_avion_id, lane_counter
+        prox_avion_id -= 1
+        av = Avion(prox_avion_id, t, dist, vel, APPROACH)
+        en_vuelo.insert(0, av)  #*El id nuevo es el mas chico, asi en_vuelo queda ordenado por id (el mas nuevo primero)
+        cohort[av.id] = av
+        insort(orden, (av.distancia_a_aep, av.id))
+        lanes[av.id] = lane_counter
+        lane_counter += 1
+        ys_en_vuelo.append(lanes[av.id] * lane_step) #*Valores irreales para calcular la posicion vertical del avion
+
+    for t in tiempos_iniciales:  #*del mas viejo (el mas cerca de AEP) al mas nuevo, igual que si hubieran aparecido simulando
+        aparecer(t, *_RECORRIDO_LIBRE[-t - 1])
 
 
     for t in range(t_inicio, t_final):
 
         if t in spawns:
-            prox_avion_id -= 1
-            av = Avion(prox_avion_id, t, 100.0, 300.0, "approach")
-            vuelos.append(av)
-            cohort[av.id] = av
-            lanes[av.id] = lane_counter
-            lane_counter += 1
+            aparecer(t, 100.0, 300.0)
 
         
-        for f in sorted(vuelos, key=lambda a: a.id):  #?Esto todavia no entendi para que sirve pero es IMPORTANTE
-            f.step(cohort=cohort, dt_min=1.0)
+        #*en_vuelo ya esta ordenado por id (el mas nuevo primero), asi que se recorre directo sin el sorted.
+        #*Los landed/diverted no se recorren: step no les hace nada y a la larga son casi todos los vuelos
+        termino_alguno = False
+        for f in en_vuelo:
+            #*Saco al avion de orden mientras se mueve y lo vuelvo a meter con su distancia nueva si sigue en approach/delayed
+            if f.status <= DELAYED:  #*approach o delayed
+                del orden[bisect_left(orden, (f.distancia_a_aep, f.id))]
+            f.step(cohort=cohort, orden=orden, dt_min=1.0)
+            st = f.status
+            if st <= DELAYED:
+                insort(orden, (f.distancia_a_aep, f.id))
+            elif st >= DIVERTED:
+                termino_alguno = True
+        if termino_alguno:
+            en_vuelo = [f for f in en_vuelo if f.status < DIVERTED]
+            ys_en_vuelo = [lanes[v.id] * lane_step for v in reversed(en_vuelo)]
 
 
         if t >= 0: #*Esto solo para empezar a capturar la simulacion a partir del t0 en caso de que hayas hecho un warm up desde numeros anteriores
-            xs, ys, cs = [], [], []
-            for v in vuelos:
-                if v.status in ("diverted", "landed"):
-                    continue 
-                xs.append(max(0.0, min(x_max, v.distancia_a_aep)))
-                ys.append(lanes[v.id] * lane_step) #*Valores irreales para calcular la posicion vertical del avion
-                cs.append(color_estados(v.status))
-            frames.append((xs, ys, cs))
-
+            #*en_vuelo son justo los que no estan ni diverted ni landed; al reves quedan en orden de aparicion
+            k = len(en_vuelo)
+            xs_frames[fila, :k] = [v.distancia_a_aep for v in reversed(en_vuelo)]
+            ys_frames[fila, :k] = ys_en_vuelo
+            estados_frames[fila, :k] = [v.status for v in reversed(en_vuelo)]
+            cuantos[fila] = k
+            fila += 1
+
+    np.clip(xs_frames, 0.0, x_max, out=xs_frames)  #*el recorte a [0, x_max] de todos los frames de una
+    frames = (xs_frames, ys_frames, estados_frames, cuantos)
     return frames, lanes
 
 
 
 #!Visualizacion (por ahora todo chat)
-def save_gif_frames(frames, lanes, out_path="sim_ej1.gif", fps=10):
+def _preparar_figura(n_lanes):
     fig, ax = plt.subplots(figsize=(10, 5))
     ax.set_xlim(0, x_max)       
-    ax.set_ylim(-1, max(2, len(lanes)) * 1.2)
+    ax.set_ylim(-1, max(2, n_lanes) * 1.2)
     ax.invert_xaxis()
     ax.set_xlabel("Distancia a AEP (nm)")
     ax.set_ylabel("Pista visual por avión")
 
  
-    vline_100 = ax.axvline(
+    ax.axvline(
         100, linestyle="--", color="k", alpha=0.6, linewidth=1.5, zorder=1
     )
 
@@ -254,52 +336,76 @@ def save_gif_frames(frames, lanes, out_path="sim_ej1.gif", fps=10):
         Line2D([0],[0], marker='o', linestyle='None', color='gray',       label='diverted'),
     ]
     ax.legend(handles=legend_handles, loc="upper right")
-
-    def init():
-        scat.set_offsets(np.empty((0, 2)))  
-        scat.set_color([])                  
-        return (scat, vline_100)
-
-    def update(i):
-        xs, ys, cs = frames[i]
-        if xs:  
-            offs = np.column_stack([xs, ys])  
-            scat.set_offsets(offs)
-            scat.set_color(cs)                 
-        else:  
-            scat.set_offsets(np.empty((0, 2)))
-            scat.set_color([])
-        ax.set_title(f"Aproximaciones – t = {i} min")
-        return (scat, vline_100)
-
-    
-    anim = animation.FuncAnimation(
-        fig, update, init_func=init,
-        frames=len(frames), interval=1000 / fps, blit=True
-    )
+    return fig, ax, scat
+
+def _renderizar_bloque(frames, n_lanes, i0):
+    #*Dibuja los frames de un bloque (fila j = minuto i0 + j) y los devuelve ya pasados a paleta como los guarda el GIF.
+    #*Es una funcion suelta para poder mandarla a otro proceso
+    xs_frames, ys_frames, estados_frames, cuantos = frames
+    fig, ax, scat = _preparar_figura(n_lanes)
+    #*Buffers de posiciones y colores armados una sola vez: en cada frame se pisan las primeras k filas y se pasan vistas
+    offsets = np.empty((xs_frames.shape[1], 2))
+    colores = np.empty((xs_frames.shape[1], 4))
+    imgs = []
     try:
-        writer = animation.PillowWriter(fps=fps)
-        anim.save(out_path, writer=writer)
-        print(f"GIF guardado en {out_path}")
+        for j, k in enumerate(cuantos):
+            offsets[:k, 0] = xs_frames[j, :k]
+            offsets[:k, 1] = ys_frames[j, :k]
+            np.take(PALETA_RGBA, estados_frames[j, :k], axis=0, out=colores[:k])
+            scat.set_offsets(offsets[:k])
+            scat.set_color(colores[:k])
+            ax.set_title(f"Aproximaciones – t = {i0 + j} min")
+
+            buf = BytesIO()
+            fig.savefig(buf, format="rgba", dpi=fig.dpi)
+            im = Image.frombuffer("RGBA", fig.canvas.get_width_height(), buf.getbuffer(), "raw", "RGBA", 0, 1)
+            imgs.append(im.convert("RGB").convert("P", palette=Image.Palette.ADAPTIVE))
     finally:
         plt.close(fig)
+    return imgs
+
+def save_gif_frames(frames, lanes, out_path="sim_ej1.gif", fps=10, n_workers=1):
+    #*Cada frame se dibuja independiente de los demas, asi que con n_workers > 1 se reparten en bloques contiguos
+    #*entre procesos y despues se pegan en orden (mismo GIF que con un solo proceso)
+    cuantos = frames[3]
+    n = len(cuantos)
+    cortes = np.linspace(0, n, max(1, min(n_workers, n)) + 1).astype(int)
+    bloques = [tuple(a[c0:c1] for a in frames) for c0, c1 in zip(cortes[:-1], cortes[1:])]
+
+    if len(bloques) == 1:
+        imgs = _renderizar_bloque(bloques[0], len(lanes), 0)
+    else:
+        with ProcessPoolExecutor(max_workers=len(bloques)) as ex:
+            partes = ex.map(_renderizar_bloque, bloques, [len(lanes)]*len(bloques), cortes[:-1].tolist())
+            imgs = [im for parte in partes for im in parte]
+
+    imgs[0].save(out_path, save_all=True, append_images=imgs[1:], duration=int(1000 / fps), loop=0)
+    print(f"GIF guardado en {out_path}")
 
 #! ---------------------------------------EJERCICIO 3 ------------------------------------------
 #! Estimar la proba de que llegen exactamente 5 aviones en una hora 
 #! ---------------------------------------------------------------------------------------------
-def proba5_aviones(lam = 1/60, horas = 10000, seed = 42):
+def proba5_aviones_exacta(lam = 1/60, k = 5, n = 60):
+    #*N ~ Binom(n=60, p=lambda) (ver la verificacion analitica al final del archivo), asi que no hace falta simular
+    p = math.comb(n, k) * lam**k * (1 - lam)**(n - k)
+    return p, n*lam
+
+def proba5_aviones(lam = 1/60, horas = 10000, seed = 42, metodo = "minutos"):
+    #*Estima simulando (el valor exacto sale de proba5_aviones_exacta). metodo = "minutos" es la version de siempre que
+    #*arma los arribos minuto a minuto con tiempos_de_spawn y los cuenta por hora; "mc" sortea directo cuantos arribos
+    #*hay en cada hora (Binom(60, lambda), todas las horas de una)
+    if metodo == "mc":
+        contador = np.random.default_rng(seed).binomial(60, lam, size=horas)
+        return float(np.count_nonzero(contador == 5)) / horas, float(contador.sum())/horas
     
     t0, t1 = 0, horas*60
     spawns = tiempos_de_spawn(lam, t0, t1, seed)
 
-    contador = [0]*horas #Crea un array de 0's de size horas
-    for t in spawns:
-        hora = t//60  #Como la funcion tiempos de spawn esta en minutos, quiero pasarlo a horas con division entera (redondea hacia abajo)
-        if hora < horas:
-            contador[hora] +=1
+    #Como la funcion tiempos de spawn esta en minutos, quiero pasarlo a horas con division entera y contar cuantos caen en cada hora
+    contador = np.bincount(np.asarray(spawns, dtype=np.int64) // 60, minlength=horas)
     
-    proba5 = sum(1 for c in contador if c == 5) / horas #Hago el promedio sumando 1 si y solo si el contador en la hora c = 5 (es decir llegaron 5 aviones en esa hora)
-    mediaArribos = sum(contador)/horas #solo sirve como una especie de sanity check
+    proba5 = float(np.count_nonzero(contador == 5)) / horas #Fraccion de horas en las que llegaron exactamente 5 aviones
+    mediaArribos = float(contador.sum())/horas #solo sirve como una especie de sanity check
 
     return proba5, mediaArribos
 
@@ -308,7 +414,7 @@ def proba5_aviones(lam = 1/60, horas = 10000, seed = 42):
 if __name__ == "__main__":
     # λ = prob de aparición por minuto
     lam = 0.5       # ≈ 6 aviones/hora de arribo al horizonte
-    warmup = 120     # arrancar 2 horas “antes” (minutos relativos)
+    warmup = 120     # arrancar 2 horas “antes” (minutos relativos); simular(..., warmup="analitico") se las saltea pero con λ alto arranca con menos cola
     t_obs = 1080     # ventana de observación (06:00–24:00)
 
     frames, lanes = simular(
@@ -318,12 +424,14 @@ if __name__ == "__main__":
         seed=42,
     )
 
-    save_gif_frames(frames, lanes, out_path="sim_ej1.gif", fps=10)
+    save_gif_frames(frames, lanes, out_path="sim_ej1.gif", fps=10, n_workers=os.cpu_count() or 1)
 
     #? Main ejercicio 3
     lamEj3 = 1/60
-    proba5, mediaArribos = proba5_aviones(lamEj3, 50_000, 42)
+    proba5, mediaArribos = proba5_aviones(lamEj3, 50_000, 42, metodo="mc")
     print(f"[EJ3] λ={lamEj3:.6f} -> P(#=5 en 1h)≈ {proba5:.6f} | media por hora≈ {mediaArribos:.4f}")
+    proba5, mediaArribos = proba5_aviones_exacta(lamEj3)
+    print(f"[EJ3] λ={lamEj3:.6f} -> P(#=5 en 1h)= {proba5:.6f} | media por hora= {mediaArribos:.4f} (exacto)")
 
 
 